@@ -1,49 +1,136 @@
-from qiskit import QuantumCircuit, transpile
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+from qiskit import QuantumCircuit
 from qiskit.circuit.library import TwoLocal
-from qiskit.transpiler import CouplingMap
 
-def demo_chemistry_fidelity(n_qubits=4):
+# Shared helpers live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _topologies import _all_to_all_map, _linear_map
+from _transpile_cache import cached_transpile_stats_many, load_baseline_stats
+
+# Gate classes for the fidelity report (competitor basis: cx/rz/sx/x,
+# IonQ basis: rxx/rx/ry)
+ONE_Q_GATES = frozenset({'rx', 'ry', 'rz', 'sx', 'x'})
+TWO_Q_GATES = frozenset({'cx', 'rxx', 'cz'})
+
+# Full demo report, filled in by format_report() and written in one go
+REPORT_TEMPLATE = """
+--- 🔬 MOLECULAR SIMULATION EFFICIENCY REPORT ---
+Ansatz: {n_qubits}-qubit VQE (Variational Quantum Eigensolver)
+Target: Carbon Dioxide or Metal-Organic Framework Fragment
+
+[Competitor (CNOT Basis + Linear Topology)]
+  - 1-Qubit Gates: {comp_1q_count}
+  - Critical 2-Qubit Gates: {comp_2q_count}
+  - Total Circuit Depth: {comp_depth} layers
+  - Error Accumulation: ~{comp_error:.1%} (assuming 1% per 2q-gate)
+
+[IonQ (Native MS/RXX Basis + All-to-All Topology)]
+  - 1-Qubit Gates: {ionq_1q_count}
+  - Critical 2-Qubit Gates: {ionq_2q_count}
+  - Total Circuit Depth: {ionq_depth} layers
+  - Error Accumulation: ~{ionq_error:.1%} (assuming 0.1% per native gate)
+
+>>> ADVANTAGE: IonQ simulation uses {gate_reduction} fewer critical gates.
+>>> DEPTH RATIO: IonQ circuit is {depth_ratio:.1f}x shallower.
+
+>>> WHY THIS MATTERS FOR CHEMISTRY:
+    - Every 2-qubit gate introduces error (~1% for competitors, 0.1% for IonQ)
+    - Chemistry requires 'Chemical Accuracy' (~1.6 mHartree tolerance)
+    - Competitor: {comp_2q_count} errors multiply → Signal lost in noise
+    - IonQ: {ionq_2q_count} errors → Clean, usable energy surface
+
+>>> NATIVE GATE ADVANTAGE:
+    - We aren't forcing the hardware to speak CNOT language
+    - We speak IonQ's native language (Mølmer–Sørensen)
+    - That's {gate_reduction} fewer 'translation errors'
+"""
+
+def _tally_gates(ops):
+    """Count (1-qubit, 2-qubit) gates in a count_ops dict in a single pass."""
+    one_q = two_q = 0
+    for name, count in ops.items():
+        if name in TWO_Q_GATES:
+            two_q += count
+        elif name in ONE_Q_GATES:
+            one_q += count
+    return one_q, two_q
+
+@functools.lru_cache(maxsize=32)
+def _cached_twolocal(n_qubits, reps, entanglement):
+    """Build (once per parameter set) the ry/rz + cz TwoLocal ansatz. Do not mutate the result."""
+    return TwoLocal(n_qubits, ['ry', 'rz'], 'cz', entanglement=entanglement, reps=reps)
+
+def compile_jobs(n_qubits=4):
     """
-    Demonstrates the advantage of IonQ's Native Gate Set (MS Gate)
-    over standard CNOT decomposition for Chemistry Ansatzes (VQE).
+    Build the compile jobs for this demo, in cached_transpile_stats_many format.
 
-    The key insight: Chemistry simulations require extreme fidelity.
-    Every 2-qubit gate adds error. IonQ's native gates minimize gates.
+    Returns [(circuit, kwargs) for the competitor, (circuit, kwargs) for IonQ].
     """
-    print(f"--- 🧪 Chemistry Demo: Molecular Ansatz Efficiency (VQE) ---")
-    print(f"Simulating a {n_qubits}-qubit molecule (e.g., Carbon Dioxide Fragment)...\n")
-
     # 1. Create a Chemistry "Ansatz"
     # This is the trial wavefunction we tune to find the molecule's ground state energy.
     # We use a 'TwoLocal' circuit, very common in VQE (Variational Quantum Eigensolver).
     # It consists of Rotation layers (single qubit) and Entanglement layers (two qubit).
-    ansatz = TwoLocal(n_qubits, ['ry', 'rz'], 'cz', entanglement='full', reps=3)
+    ansatz = _cached_twolocal(n_qubits, reps=3, entanglement='full')
 
     # 2. Define the Hardware Constraints
 
     # COMPETITOR: Standard Superconducting (Linear Topology + CNOT Basis)
     # They must use CNOT (cx) gates, often with multiple decomposition steps.
     competitor_basis = ['cx', 'rz', 'sx', 'x']
-    competitor_map = CouplingMap.from_line(n_qubits)
+    competitor_map = _linear_map(n_qubits)
 
     # IONQ: Trapped Ion (All-to-All + Native MS Basis)
     # IonQ's native entangling gate is the Mølmer–Sørensen (MS) gate.
     # In Qiskit, this is represented as 'rxx' (Ising coupling).
     ionq_basis = ['rxx', 'ry', 'rx']
-    ionq_map = None  # All-to-All
-
-    # 3. Compile (Transpile)
-    print("[Compiling for COMPETITOR (Standard CNOT basis + Linear topology)]...")
-    comp_circuit = transpile(ansatz,
-                             coupling_map=competitor_map,
-                             basis_gates=competitor_basis,
-                             optimization_level=3)
-
-    print("[Compiling for IONQ (Native MS/RXX basis + All-to-All topology)]...")
-    ionq_circuit = transpile(ansatz,
-                             coupling_map=ionq_map,
-                             basis_gates=ionq_basis,
-                             optimization_level=3)
+    ionq_map = _all_to_all_map(n_qubits)  # All-to-All
+
+    return [
+        # SABRE routing is stochastic: keep the best of 8 seeded runs
+        (ansatz, {'coupling_map': competitor_map,
+                  'basis_gates': competitor_basis,
+                  'trials': 8}),
+        (ansatz, {'coupling_map': ionq_map,
+                  'basis_gates': ionq_basis}),
+    ]
+
+def compute_stats(n_qubits=4, use_baseline=False, compiled=None):
+    """
+    Compile the ansatz for both targets and collect the report inputs (no printing).
+
+    Args:
+        n_qubits: Number of qubits in the ansatz
+        use_baseline: Use precomputed results (see baselines/compute_baselines.py)
+                      when they exist for these parameters
+        compiled: (competitor_stats, ionq_stats) already computed from
+                  compile_jobs(), e.g. by run_all_demos.py
+
+    Returns:
+        Dictionary with 'params', 'competitor', 'ionq' ({'depth', 'count_ops'})
+        and 'from_baseline'
+    """
+    from_baseline = False
+    if compiled is None and use_baseline:
+        compiled = load_baseline_stats(f"chemistry/{n_qubits}")
+        from_baseline = compiled is not None
+    if compiled is None:
+        # 3. Compile (Transpile) - both targets are independent, so they compile in parallel
+        compiled = cached_transpile_stats_many(compile_jobs(n_qubits))
+    comp_stats, ionq_stats = compiled
+    return {
+        'params': {'n_qubits': n_qubits},
+        'competitor': comp_stats,
+        'ionq': ionq_stats,
+        'from_baseline': from_baseline,
+    }
+
+def format_report(stats):
+    """Render the "Fidelity" report for compute_stats() output."""
+    n_qubits = stats['params']['n_qubits']
 
     # 4. The "Fidelity" Report
     # In VQE, the killer metric is the "Two-Qubit Gate Count".
@@ -51,54 +138,61 @@ def demo_chemistry_fidelity(n_qubits=4):
     # In chemistry, we care about "Chemical Accuracy" (~1.6 mHartree).
     # Too much error → fail to reach chemical accuracy.
 
-    comp_ops = comp_circuit.count_ops()
-    ionq_ops = ionq_circuit.count_ops()
+    comp_1q_count, comp_2q_count = _tally_gates(stats['competitor']['count_ops'])
+    ionq_1q_count, ionq_2q_count = _tally_gates(stats['ionq']['count_ops'])
 
-    comp_2q_count = comp_ops.get('cx', 0)
-    ionq_2q_count = ionq_ops.get('rxx', 0)
+    # Calculate Depth (Time for quantum decoherence to set in)
+    comp_depth = stats['competitor']['depth']
+    ionq_depth = stats['ionq']['depth']
 
-    comp_1q_count = sum([comp_ops.get(g, 0) for g in ['rx', 'ry', 'rz', 'sx', 'x']])
-    ionq_1q_count = sum([ionq_ops.get(g, 0) for g in ['rx', 'ry', 'rz']])
+    # Improvement calculation
+    gate_reduction = comp_2q_count - ionq_2q_count
+    depth_ratio = comp_depth / ionq_depth if ionq_depth > 0 else float('inf')
 
-    # Calculate Depth (Time for quantum decoherence to set in)
-    comp_depth = comp_circuit.depth()
-    ionq_depth = ionq_circuit.depth()
+    return REPORT_TEMPLATE.format(n_qubits=n_qubits,
+                                  comp_1q_count=comp_1q_count, comp_2q_count=comp_2q_count,
+                                  comp_depth=comp_depth, comp_error=comp_2q_count * 0.01,
+                                  ionq_1q_count=ionq_1q_count, ionq_2q_count=ionq_2q_count,
+                                  ionq_depth=ionq_depth, ionq_error=ionq_2q_count * 0.001,
+                                  gate_reduction=gate_reduction, depth_ratio=depth_ratio)
 
-    print(f"\n--- 🔬 MOLECULAR SIMULATION EFFICIENCY REPORT ---")
-    print(f"Ansatz: {n_qubits}-qubit VQE (Variational Quantum Eigensolver)")
-    print(f"Target: Carbon Dioxide or Metal-Organic Framework Fragment\n")
+def demo_chemistry_fidelity(n_qubits=4, use_baseline=False):
+    """
+    Demonstrates the advantage of IonQ's Native Gate Set (MS Gate)
+    over standard CNOT decomposition for Chemistry Ansatzes (VQE).
 
-    print(f"[Competitor (CNOT Basis + Linear Topology)]")
-    print(f"  - 1-Qubit Gates: {comp_1q_count}")
-    print(f"  - Critical 2-Qubit Gates: {comp_2q_count}")
-    print(f"  - Total Circuit Depth: {comp_depth} layers")
-    print(f"  - Error Accumulation: ~{comp_2q_count * 0.01:.1%} (assuming 1% per 2q-gate)")
+    The key insight: Chemistry simulations require extreme fidelity.
+    Every 2-qubit gate adds error. IonQ's native gates minimize gates.
 
-    print(f"\n[IonQ (Native MS/RXX Basis + All-to-All Topology)]")
-    print(f"  - 1-Qubit Gates: {ionq_1q_count}")
-    print(f"  - Critical 2-Qubit Gates: {ionq_2q_count}")
-    print(f"  - Total Circuit Depth: {ionq_depth} layers")
-    print(f"  - Error Accumulation: ~{ionq_2q_count * 0.001:.1%} (assuming 0.1% per native gate)")
+    If use_baseline is set and precomputed results exist for these parameters
+    (see baselines/compute_baselines.py), they are used instead of compiling.
 
-    # Improvement calculation
-    gate_reduction = comp_2q_count - ionq_2q_count
-    depth_ratio = comp_depth / ionq_depth if ionq_depth > 0 else float('inf')
+    Returns (comp_stats, ionq_stats), each {'depth': ..., 'count_ops': ...}.
+    """
+    # Flush the header now: compiling can take a while
+    sys.stdout.write(f"--- 🧪 Chemistry Demo: Molecular Ansatz Efficiency (VQE) ---\n"
+                     f"Simulating a {n_qubits}-qubit molecule (e.g., Carbon Dioxide Fragment)...\n\n")
+    sys.stdout.flush()
 
-    print(f"\n>>> ADVANTAGE: IonQ simulation uses {gate_reduction} fewer critical gates.")
-    print(f">>> DEPTH RATIO: IonQ circuit is {depth_ratio:.1f}x shallower.")
-    print(f"\n>>> WHY THIS MATTERS FOR CHEMISTRY:")
-    print(f"    - Every 2-qubit gate introduces error (~1% for competitors, 0.1% for IonQ)")
-    print(f"    - Chemistry requires 'Chemical Accuracy' (~1.6 mHartree tolerance)")
-    print(f"    - Competitor: {comp_2q_count} errors multiply → Signal lost in noise")
-    print(f"    - IonQ: {ionq_2q_count} errors → Clean, usable energy surface")
-    print(f"\n>>> NATIVE GATE ADVANTAGE:")
-    print(f"    - We aren't forcing the hardware to speak CNOT language")
-    print(f"    - We speak IonQ's native language (Mølmer–Sørensen)")
-    print(f"    - That's {gate_reduction} fewer 'translation errors'")
+    stats = compute_stats(n_qubits, use_baseline=use_baseline)
+    if stats['from_baseline']:
+        status = "[Using precomputed compilation results (baselines/baseline_stats.json)]...\n"
+    else:
+        status = ("[Compiling for COMPETITOR (Standard CNOT basis + Linear topology)]...\n"
+                  "[Compiling for IONQ (Native MS/RXX basis + All-to-All topology)]...\n")
+
+    sys.stdout.write(status + format_report(stats))
+
+    return stats['competitor'], stats['ionq']
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Demo 2: Chemistry Ansatz Efficiency (VQE)")
+    parser.add_argument("--use-cache", action=argparse.BooleanOptionalAction, default=True,
+                        help="Use precomputed compilation results when available (default: on)")
+    args = parser.parse_args()
+
     # Try increasing qubits to see the advantage grow
     # n_qubits=4 → baseline
     # n_qubits=6 → noticeable advantage
     # n_qubits=8 → dramatic advantage (but takes longer to compile)
-    demo_chemistry_fidelity(n_qubits=6)
+    demo_chemistry_fidelity(n_qubits=6, use_baseline=args.use_cache)
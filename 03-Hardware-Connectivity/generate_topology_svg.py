@@ -1,16 +1,10 @@
-import math
+import gzip
 
-def generate_topology_svg(n_qubits=12):
-    """
-    Generates an SVG visualization of Linear vs All-to-All topologies.
-    No matplotlib dependency.
-    """
+import numpy as np
 
-    width = 1400
-    height = 600
-    margin = 50
-
-    svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+# Full document layout; the element lists are generated separately and
+# dropped in with a single str.format call
+SVG_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
     <defs>
         <style>
@@ -29,73 +23,93 @@ def generate_topology_svg(n_qubits=12):
     <!-- LEFT: Competitor Linear Topology -->
     <g id="competitor">
         <!-- Title -->
-        <text x="{width//4}" y="30" class="title">Competitor Architecture</text>
-        <text x="{width//4}" y="55" class="title" font-size="14">(Nearest Neighbor Only)</text>
+        <text x="{left_title_x}" y="30" class="title">Competitor Architecture</text>
+        <text x="{left_title_x}" y="55" class="title" font-size="14">(Nearest Neighbor Only)</text>
 
         <!-- Edges (linear chain) -->
-'''
+{linear_edges}{linear_nodes}    </g>
+
+    <!-- RIGHT: IonQ All-to-All Topology -->
+    <g id="ionq">
+        <text x="{right_title_x}" y="30" class="title">IonQ Architecture</text>
+        <text x="{right_title_x}" y="55" class="title" font-size="14">(All-to-All Connectivity)</text>
+{ionq_edges}{ionq_nodes}    </g>
+</svg>'''
+
+def generate_topology_svg(n_qubits=12, compress=False):
+    """
+    Generates an SVG visualization of Linear vs All-to-All topologies.
+    No matplotlib dependency.
+
+    With compress=True the output is written gzip-compressed as .svgz; the
+    repetitive markup shrinks ~20x, which matters for large n (the IonQ
+    side has n(n-1)/2 edges).
+    """
+
+    width = 1400
+    height = 600
+    margin = 50
 
     # Compute positions for linear layout (left side)
     left_x_start = margin + 50
     left_x_end = width // 2 - margin - 50
     left_y = height // 2
 
-    left_positions = []
-    for i in range(n_qubits):
-        x = left_x_start + (left_x_end - left_x_start) * i / (n_qubits - 1)
-        left_positions.append((x, left_y))
-
-    # Draw edges for linear
-    for i in range(n_qubits - 1):
-        x1, y1 = left_positions[i]
-        x2, y2 = left_positions[i + 1]
-        svg_content += f'        <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" class="edge-competitor"/>\n'
-
-    # Draw nodes for linear
-    for i, (x, y) in enumerate(left_positions):
-        svg_content += f'        <circle cx="{x}" cy="{y}" r="15" class="node-competitor"/>\n'
-        svg_content += f'        <text x="{x}" y="{y}" class="node-label">{i}</text>\n'
-
-    svg_content += '    </g>\n\n'
+    left_xs = np.linspace(left_x_start, left_x_end, n_qubits)
+    left_positions = [(x, left_y) for x in left_xs.tolist()]
 
-    # RIGHT: IonQ All-to-All Topology
-    svg_content += '    <!-- RIGHT: IonQ All-to-All Topology -->\n    <g id="ionq">\n'
+    # Edges for linear
+    linear_edges = ''.join(
+        f'        <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" class="edge-competitor"/>\n'
+        for (x1, y1), (x2, y2) in zip(left_positions[:-1], left_positions[1:])
+    )
 
-    # Title
-    svg_content += f'        <text x="{3*width//4}" y="30" class="title">IonQ Architecture</text>\n'
-    svg_content += f'        <text x="{3*width//4}" y="55" class="title" font-size="14">(All-to-All Connectivity)</text>\n'
+    # Nodes for linear
+    linear_nodes = ''.join(
+        f'        <circle cx="{x}" cy="{y}" r="15" class="node-competitor"/>\n'
+        f'        <text x="{x}" y="{y}" class="node-label">{i}</text>\n'
+        for i, (x, y) in enumerate(left_positions)
+    )
 
     # Compute positions for circular layout (right side)
     center_x = width * 3 // 4
     center_y = height // 2
     radius = 100
 
-    right_positions = []
-    for i in range(n_qubits):
-        angle = 2 * math.pi * i / n_qubits
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
-        right_positions.append((x, y))
-
-    # Draw edges for all-to-all (in background)
-    for i in range(n_qubits):
-        for j in range(i + 1, n_qubits):
-            x1, y1 = right_positions[i]
-            x2, y2 = right_positions[j]
-            svg_content += f'        <line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" class="edge-ionq"/>\n'
-
-    # Draw nodes for all-to-all
-    for i, (x, y) in enumerate(right_positions):
-        svg_content += f'        <circle cx="{x}" cy="{y}" r="12" class="node-ionq"/>\n'
-        svg_content += f'        <text x="{x}" y="{y}" class="node-label" font-size="10">{i}</text>\n'
-
-    svg_content += '    </g>\n'
-    svg_content += '</svg>'
-
-    # Write to file
+    angles = np.linspace(0, 2 * np.pi, n_qubits, endpoint=False)
+    xs = (center_x + radius * np.cos(angles)).tolist()
+    ys = (center_y + radius * np.sin(angles)).tolist()
+
+    # Edges for all-to-all (in background)
+    # Gather both endpoints of every pair i < j at once
+    i_idx, j_idx = np.triu_indices(n_qubits, k=1)
+    ionq_edges = ''.join(
+        f'        <line x1="{xs[i]}" y1="{ys[i]}" x2="{xs[j]}" y2="{ys[j]}" class="edge-ionq"/>\n'
+        for i, j in zip(i_idx.tolist(), j_idx.tolist())
+    )
+
+    # Nodes for all-to-all
+    ionq_nodes = ''.join(
+        f'        <circle cx="{x}" cy="{y}" r="12" class="node-ionq"/>\n'
+        f'        <text x="{x}" y="{y}" class="node-label" font-size="10">{i}</text>\n'
+        for i, (x, y) in enumerate(zip(xs, ys))
+    )
+
+    svg = SVG_TEMPLATE.format(width=width, height=height,
+                              left_title_x=width // 4, right_title_x=3 * width // 4,
+                              linear_edges=linear_edges, linear_nodes=linear_nodes,
+                              ionq_edges=ionq_edges, ionq_nodes=ionq_nodes)
+
+    # Write to file in a single buffered binary write
     output_path = f"figures/topology_comparison_{n_qubits}qubits.svg"
-    with open(output_path, 'w') as f:
-        f.write(svg_content)
+    data = svg.encode('utf-8')
+    if compress:
+        output_path += 'z'
+        with gzip.open(output_path, 'wb', compresslevel=6) as f:
+            f.write(data)
+    else:
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(data)
 
     print(f"✓ SVG visualization saved to: {output_path}")
 
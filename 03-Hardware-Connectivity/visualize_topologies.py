@@ -1,58 +1,69 @@
-import networkx as nx
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend to avoid display issues
-import matplotlib.pyplot as plt
-import itertools
+# Plotting libraries are imported inside the functions: matplotlib's backend
+# setup is slow, and importing this module shouldn't pay for it unless a
+# figure is actually drawn.
+
+def _draw_nodes(ax, positions, color, radius):
+    """Draw all nodes as one PatchCollection with white index labels on top."""
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import Circle
+
+    ax.add_collection(PatchCollection([Circle(p, radius) for p in positions],
+                                      facecolor=color, edgecolor='none', zorder=2))
+    for i, (x, y) in enumerate(positions):
+        ax.text(x, y, str(i), ha='center', va='center', color='white', zorder=3)
 
 def visualize_topologies(n_qubits=10):
     """
     Generates side-by-side plots of a Standard Linear Topology vs. IonQ's All-to-All Topology.
     """
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend to avoid display issues
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    import numpy as np
+
     # Create the figure
-    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6), layout='constrained')
 
     # --- 1. COMPETITOR: Linear Topology (The Chain) ---
-    G_linear = nx.Graph()
-    G_linear.add_nodes_from(range(n_qubits))
-    # Connect i to i+1
-    linear_edges = [(i, i+1) for i in range(n_qubits-1)]
-    G_linear.add_edges_from(linear_edges)
-
-    pos_linear = nx.spring_layout(G_linear, seed=42) # Or simply a line layout
     # Force a straight line layout for maximum visual impact
-    pos_linear = {i: (i, 0) for i in range(n_qubits)}
+    pos_linear = np.column_stack([np.arange(n_qubits), np.zeros(n_qubits)])
 
-    nx.draw_networkx_nodes(G_linear, pos_linear, ax=axes[0], node_color='#FF6B6B', node_size=500)
-    nx.draw_networkx_labels(G_linear, pos_linear, ax=axes[0], font_color='white')
-    nx.draw_networkx_edges(G_linear, pos_linear, ax=axes[0], edge_color='gray', width=2)
+    # Connect i to i+1
+    linear_segments = np.stack([pos_linear[:-1], pos_linear[1:]], axis=1)
+    axes[0].add_collection(LineCollection(linear_segments, colors='gray', linewidths=2, zorder=1))
+    _draw_nodes(axes[0], pos_linear, '#FF6B6B', 0.3)
 
+    axes[0].set_xlim(-1, n_qubits)
+    axes[0].set_ylim(-2, 2)
+    axes[0].set_aspect('equal')
     axes[0].set_title(f"Competitor Architecture\n(Nearest Neighbor Only)", fontsize=14, fontweight='bold')
     axes[0].set_axis_off()
 
     # --- 2. IONQ: All-to-All Topology (The Web) ---
-    G_ionq = nx.Graph()
-    G_ionq.add_nodes_from(range(n_qubits))
-    # Connect every node to every other node
-    all_edges = list(itertools.combinations(range(n_qubits), 2))
-    G_ionq.add_edges_from(all_edges)
-
     # Circular layout highlights the 'everything touches everything' nature
-    pos_ionq = nx.circular_layout(G_ionq)
+    angles = np.linspace(0, 2 * np.pi, n_qubits, endpoint=False)
+    pos_ionq = np.column_stack([np.cos(angles), np.sin(angles)])
 
-    nx.draw_networkx_nodes(G_ionq, pos_ionq, ax=axes[1], node_color='#4D96FF', node_size=500)
-    nx.draw_networkx_labels(G_ionq, pos_ionq, ax=axes[1], font_color='white')
+    # Connect every node to every other node, drawn as a single collection
+    i, j = np.triu_indices(n_qubits, k=1)
+    ionq_segments = np.stack([pos_ionq[i], pos_ionq[j]], axis=1)
     # Make edges semi-transparent so it doesn't look like a solid blob
-    nx.draw_networkx_edges(G_ionq, pos_ionq, ax=axes[1], edge_color='#4D96FF', alpha=0.3, width=1.5)
+    axes[1].add_collection(LineCollection(ionq_segments, colors='#4D96FF', alpha=0.3,
+                                          linewidths=1.5, zorder=1))
+    _draw_nodes(axes[1], pos_ionq, '#4D96FF', 0.12)
 
+    axes[1].set_xlim(-1.3, 1.3)
+    axes[1].set_ylim(-1.3, 1.3)
+    axes[1].set_aspect('equal')
     axes[1].set_title(f"IonQ Architecture\n(All-to-All Connectivity)", fontsize=14, fontweight='bold')
     axes[1].set_axis_off()
 
     # Save the plot
-    plt.tight_layout()
     output_path = f"figures/topology_comparison_{n_qubits}qubits.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight')
+    fig.savefig(output_path, dpi=150, facecolor='white')
     print(f"Visualization saved to: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 if __name__ == "__main__":
     visualize_topologies(n_qubits=12) # 12 is a good number to show the density difference
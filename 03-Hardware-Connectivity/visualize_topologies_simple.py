@@ -1,15 +1,19 @@
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import numpy as np
+# Plotting libraries are imported inside the function so that importing
+# this module stays cheap until a figure is actually drawn.
 
 def visualize_topologies_simple(n_qubits=12):
     """
     Simple visualization of Linear vs All-to-All topologies without networkx.
     Avoids compatibility issues and renders directly.
     """
-    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as patches
+    from matplotlib.collections import LineCollection
+    import numpy as np
+
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6), layout='constrained')
 
     # --- 1. COMPETITOR: Linear Topology ---
     ax = axes[0]
@@ -39,11 +43,10 @@ def visualize_topologies_simple(n_qubits=12):
     positions = np.array([[np.cos(angle), np.sin(angle)] for angle in angles])
 
     # Draw edges (all-to-all) - thin and semi-transparent
-    for i in range(n_qubits):
-        for j in range(i + 1, n_qubits):
-            x = [positions[i][0], positions[j][0]]
-            y = [positions[i][1], positions[j][1]]
-            ax.plot(x, y, color='#4D96FF', linewidth=0.5, alpha=0.2)
+    # A single LineCollection instead of one ax.plot artist per edge
+    i, j = np.triu_indices(n_qubits, k=1)
+    segments = np.stack([positions[i], positions[j]], axis=1)
+    ax.add_collection(LineCollection(segments, colors='#4D96FF', linewidths=0.5, alpha=0.2))
 
     # Draw nodes
     for i, (x, y) in enumerate(positions):
@@ -56,11 +59,10 @@ def visualize_topologies_simple(n_qubits=12):
     ax.set_aspect('equal')
 
     # Save
-    plt.tight_layout()
     output_path = f"figures/topology_comparison_{n_qubits}qubits.png"
-    plt.savefig(output_path, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.savefig(output_path, dpi=150, facecolor='white')
     print(f"✓ Visualization saved to: {output_path}")
-    plt.close()
+    plt.close(fig)
 
 if __name__ == "__main__":
     visualize_topologies_simple(n_qubits=12)
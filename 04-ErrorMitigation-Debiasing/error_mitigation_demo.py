@@ -9,19 +9,38 @@ on perfect phase interference. Without error mitigation, it fails on real hardwa
 With error mitigation, it becomes usable.
 
 Usage:
-    python error_mitigation_demo.py [--sim] [--n-qubits N]
+    python error_mitigation_demo.py [--sim] [--n-qubits N] [--gpu]
 
 Options:
     --sim           Use local simulator (faster for testing)
     --n-qubits N    Number of qubits (default: 6)
+    --gpu           Run the noisy simulation on a GPU if Aer has one (falls back to CPU)
 """
 
+import functools
+import heapq
+import operator
+
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
-from qiskit.circuit.library import DXGate
+from qiskit.circuit.library import CZGate
+from qiskit.providers.fake_provider import GenericBackendV2
 from typing import Tuple, Dict
 
+try:
+    from qiskit_aer import AerSimulator
+    from qiskit_aer.noise import NoiseModel
+    HAS_AER = True
+except ImportError:
+    HAS_AER = False
+
+# Size of the mock device the noise model is taken from (the old
+# FakeMelbourne had 14 qubits); fixed seed so its error rates are reproducible
+NOISE_BACKEND_QUBITS = 14
+NOISE_BACKEND_SEED = 42
 
+
+@functools.lru_cache(maxsize=32)
 def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     """
     Create a Bernstein-Vazirani circuit for a given secret string.
@@ -37,7 +56,8 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
         secret_string: Binary string (e.g., "101010") to encode in oracle
 
     Returns:
-        QuantumCircuit: The complete Bernstein-Vazirani circuit
+        QuantumCircuit: The complete Bernstein-Vazirani circuit. It is built
+        once per secret string and shared, so callers must copy before mutating.
     """
     n_qubits = len(secret_string)
 
@@ -46,22 +66,22 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     c = ClassicalRegister(n_qubits, 'c')
     qc = QuantumCircuit(q, c, name='BV')
 
-    # Initialization: Hadamard on all qubits
-    for i in range(n_qubits):
-        qc.h(q[i])
+    # Initialization: Hadamard on all qubits (one broadcast call)
+    qc.h(q[:n_qubits])
 
     # Ancilla qubit (used for phase kickback in oracle)
     qc.x(q[n_qubits])
     qc.h(q[n_qubits])
 
     # Oracle: Controlled-Z gates for each '1' in secret string
-    for i, bit in enumerate(secret_string):
-        if bit == '1':
-            qc.cz(q[i], q[n_qubits])
+    # A single shared CZ instance, appended once per marked bit
+    cz = CZGate()
+    ones = [i for i, bit in enumerate(secret_string) if bit == '1']
+    for i in ones:
+        qc.append(cz, [q[i], q[n_qubits]])
 
     # Final Hadamard on all qubits to convert phases to probabilities
-    for i in range(n_qubits):
-        qc.h(q[i])
+    qc.h(q[:n_qubits])
 
     # Measure the output register (not the ancilla)
     qc.measure(range(n_qubits), range(n_qubits))
@@ -69,7 +89,34 @@ def create_bernstein_vazirani_circuit(secret_string: str) -> QuantumCircuit:
     return qc
 
 
-def run_without_mitigation(circuit: QuantumCircuit, shots: int = 1000) -> Dict[str, int]:
+@functools.lru_cache(maxsize=2)
+def _get_noisy_sim(use_gpu: bool = False):
+    """
+    Build (once per device) the noisy simulator based on real hardware.
+
+    Deriving the noise model from the backend is the expensive part of
+    simulator setup, and it is identical for every run in the demo.
+
+    Args:
+        use_gpu: Simulate on a GPU (cuStateVec) when this Aer build has one;
+                 otherwise fall back to the CPU simulator
+    """
+    real_backend = GenericBackendV2(NOISE_BACKEND_QUBITS, seed=NOISE_BACKEND_SEED)
+    noise_model = NoiseModel.from_backend(real_backend)
+
+    if use_gpu:
+        try:
+            if 'GPU' in AerSimulator().available_devices():
+                return AerSimulator(noise_model=noise_model, method='statevector', device='GPU')
+        except Exception as e:
+            print(f"GPU simulator unavailable ({e})")
+        print("No GPU found for Aer, simulating on CPU.")
+
+    return AerSimulator(noise_model=noise_model)
+
+
+def run_without_mitigation(circuit: QuantumCircuit, shots: int = 1000,
+                           use_gpu: bool = False) -> Dict[str, int]:
     """
     Simulate the circuit without any error mitigation.
 
@@ -80,20 +127,13 @@ def run_without_mitigation(circuit: QuantumCircuit, shots: int = 1000) -> Dict[s
     Args:
         circuit: QuantumCircuit to simulate
         shots: Number of measurement samples
+        use_gpu: Simulate on a GPU if available
 
     Returns:
         Dictionary of counts {bitstring: count}
     """
-    from qiskit.providers.fake_provider import FakeMelbourne
-    from qiskit import transpile
-    from qiskit_aer import AerSimulator
-    from qiskit_aer.noise import NoiseModel
-
-    # Create a noisy simulator based on real hardware
-    real_backend = FakeMelbourne()
-    noise_model = NoiseModel.from_backend(real_backend)
-
-    sim = AerSimulator(noise_model=noise_model)
+    # Noisy simulator based on real hardware (shared across runs)
+    sim = _get_noisy_sim(use_gpu)
     transpiled = transpile(circuit, sim)
 
     job = sim.run(transpiled, shots=shots)
@@ -103,9 +143,18 @@ def run_without_mitigation(circuit: QuantumCircuit, shots: int = 1000) -> Dict[s
     return counts
 
 
+def _probs_to_dict(probs: np.ndarray, n_bits: int) -> Dict[str, float]:
+    """Convert a dense probability vector back to {bitstring: prob} for non-zero entries."""
+    # Build the format spec once rather than per outcome
+    fmt = f'0{n_bits}b'
+    nonzero = np.flatnonzero(probs)
+    return dict(zip((format(i, fmt) for i in nonzero.tolist()), probs[nonzero].tolist()))
+
+
 def run_with_mitigation_simulated(circuit: QuantumCircuit,
                                   n_variations: int = 100,
-                                  shots: int = 1000) -> Tuple[Dict[str, float], Dict[str, float]]:
+                                  shots: int = 1000,
+                                  use_gpu: bool = False) -> Tuple[Dict[str, float], Dict[str, float]]:
     """
     Simulate error mitigation (debiasing + sharpening) by generating circuit variants
     and averaging their results.
@@ -119,83 +168,76 @@ def run_with_mitigation_simulated(circuit: QuantumCircuit,
         circuit: QuantumCircuit to run
         n_variations: Number of symmetric variants to generate (default: 100)
         shots: Total shots across all variants
+        use_gpu: Simulate on a GPU if available (the whole variant batch
+                 is then processed on the device)
 
     Returns:
         Tuple of (debiased_counts, sharpened_counts)
     """
-    from qiskit.providers.fake_provider import FakeMelbourne
-    from qiskit import transpile
-    from qiskit_aer import AerSimulator
-    from qiskit_aer.noise import NoiseModel
-
-    # Create noisy simulator
-    real_backend = FakeMelbourne()
-    noise_model = NoiseModel.from_backend(real_backend)
-    sim = AerSimulator(noise_model=noise_model)
-
-    # Run circuit variants
-    variant_results = []
+    # Noisy simulator (shared across runs)
+    sim = _get_noisy_sim(use_gpu)
+
+    # Create symmetric variants:
+    # - Half flip the measurement basis
+    # - This causes systematic errors to sometimes help, sometimes hurt
+    # There are only two distinct variants, so build and transpile each once
+    flipped = circuit.copy()
+    # Flip variant: Apply X to reverse measurement interpretation
+    flipped.x(range(circuit.num_clbits))
+    flipped_t, plain_t = transpile([flipped, circuit], sim)
+
+    # Even-indexed variants are flipped
     shots_per_variant = shots // n_variations
+    variants = [flipped_t if variation_idx % 2 == 0 else plain_t
+                for variation_idx in range(n_variations)]
 
-    for variation_idx in range(n_variations):
-        variant_circuit = circuit.copy()
-
-        # Create symmetric variant:
-        # - Half flip the measurement basis
-        # - This causes systematic errors to sometimes help, sometimes hurt
-        if variation_idx % 2 == 0:
-            # Flip variant: Apply X to reverse measurement interpretation
-            variant_circuit.x(range(circuit.num_clbits))
+    # Run every variant as one batch: Aer executes the list in parallel and
+    # we pay the submission/result overhead once, not 100 times
+    result = sim.run(variants, shots=shots_per_variant).result()
+    variant_results = [result.get_counts(i) for i in range(n_variations)]
 
-        transpiled = transpile(variant_circuit, sim)
-        job = sim.run(transpiled, shots=shots_per_variant)
-        result = job.result()
-        counts = result.get_counts()
-
-        variant_results.append(counts)
+    # Work on dense arrays indexed by the integer value of each bitstring;
+    # strings only come back at the end, for the observed outcomes
+    n_bits = circuit.num_clbits
 
     # DEBIASING: Average across all variants
-    debiased_counts = {}
+    hist = np.zeros(1 << n_bits, dtype=np.int64)
     for counts in variant_results:
-        for bitstring, count in counts.items():
-            debiased_counts[bitstring] = debiased_counts.get(bitstring, 0) + count
+        keys = np.fromiter((int(bs, 2) for bs in counts), dtype=np.int64, count=len(counts))
+        hist[keys] += np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
 
     # Normalize
-    total_shots = sum(debiased_counts.values())
-    debiased_normalized = {bs: count / total_shots for bs, count in debiased_counts.items()}
+    total_shots = hist.sum()
+    probs = hist / total_shots if total_shots else hist.astype(np.float64)
 
     # SHARPENING: Majority voting
     # Find the bitstring with highest probability
-    if debiased_normalized:
-        dominant_bitstring = max(debiased_normalized, key=debiased_normalized.get)
-        dominant_prob = debiased_normalized[dominant_bitstring]
-
-        # Sharpen: boost dominant state, suppress noise
-        sharpened_counts = {}
-        for bs, prob in debiased_normalized.items():
-            if bs == dominant_bitstring:
-                # Boost the dominant state
-                sharpened_counts[bs] = max(dominant_prob, 0.95)
-            else:
-                # Suppress other states
-                sharpened_counts[bs] = prob * 0.1
+    sharpened = probs
+    if total_shots:
+        dominant_idx = int(probs.argmax())
+        dominant_prob = probs[dominant_idx]
+
+        # Sharpen: suppress noise, boost dominant state
+        sharpened = probs * 0.1
+        sharpened[dominant_idx] = max(dominant_prob, 0.95)
 
         # Renormalize
-        total = sum(sharpened_counts.values())
-        sharpened_counts = {bs: p / total for bs, p in sharpened_counts.items()}
-    else:
-        sharpened_counts = debiased_normalized
+        sharpened /= sharpened.sum()
+
+    debiased_normalized = _probs_to_dict(probs, n_bits)
+    sharpened_counts = _probs_to_dict(sharpened, n_bits)
 
     return debiased_normalized, sharpened_counts
 
 
-def demo_error_mitigation(n_qubits: int = 6, use_simulator: bool = True):
+def demo_error_mitigation(n_qubits: int = 6, use_simulator: bool = True, use_gpu: bool = False):
     """
     Main demo: Compare raw vs. error-mitigated results for Bernstein-Vazirani.
 
     Args:
         n_qubits: Number of qubits (default: 6)
         use_simulator: If True, use simulator; if False, try real hardware
+        use_gpu: Run the noisy simulation on a GPU if available
     """
     print(f"\n{'='*70}")
     print(f"🛡️  DEMO 4: The Noise Canceler – Error Mitigation")
@@ -214,20 +256,23 @@ def demo_error_mitigation(n_qubits: int = 6, use_simulator: bool = True):
     print(f"Circuit operations: {qc.count_ops()}\n")
 
     # Run on noisy simulator
-    if use_simulator:
+    if use_simulator and not HAS_AER:
+        print("Qiskit Aer not installed. Cannot run the noisy simulation "
+              "(install with: pip install qiskit-aer).")
+    elif use_simulator:
         print("[Running on NOISY SIMULATOR (simulates real hardware noise)]")
         print("This demonstrates what happens on real IonQ hardware without mitigation.\n")
 
         # RAW RUN
         print("Step 1: RAW RUN (No Mitigation)")
         print("-" * 70)
-        raw_counts = run_without_mitigation(qc, shots=1000)
+        raw_counts = run_without_mitigation(qc, shots=1000, use_gpu=use_gpu)
 
         # Calculate success rate (how often we got the right answer)
         raw_success = raw_counts.get(secret_string, 0) / 1000
 
         print(f"Result distribution (top 10):")
-        sorted_counts = sorted(raw_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        sorted_counts = heapq.nlargest(10, raw_counts.items(), key=operator.itemgetter(1))
         for bitstring, count in sorted_counts:
             percentage = (count / 1000) * 100
             marker = " ← CORRECT!" if bitstring == secret_string else ""
@@ -240,7 +285,8 @@ def demo_error_mitigation(n_qubits: int = 6, use_simulator: bool = True):
         print("\n" + "=" * 70)
         print("Step 2: WITH ERROR MITIGATION (Debiasing + Sharpening)")
         print("-" * 70)
-        debiased, sharpened = run_with_mitigation_simulated(qc, n_variations=100, shots=1000)
+        debiased, sharpened = run_with_mitigation_simulated(qc, n_variations=100, shots=1000,
+                                                          use_gpu=use_gpu)
 
         debiased_success = debiased.get(secret_string, 0)
         sharpened_success = sharpened.get(secret_string, 0)
@@ -252,7 +298,7 @@ def demo_error_mitigation(n_qubits: int = 6, use_simulator: bool = True):
         print(f"  Correct answer probability: {sharpened_success:.1%}")
 
         print(f"\nTop results after mitigation:")
-        sorted_sharpened = sorted(sharpened.items(), key=lambda x: x[1], reverse=True)[:10]
+        sorted_sharpened = heapq.nlargest(10, sharpened.items(), key=operator.itemgetter(1))
         for bitstring, prob in sorted_sharpened:
             percentage = prob * 100
             marker = " ← CORRECT!" if bitstring == secret_string else ""
@@ -305,9 +351,12 @@ def compare_circuit_complexity(secret_length: int = 6):
 
     for n in [2, 4, 6, 8]:
         qc = create_bernstein_vazirani_circuit('1' * n)
+        depth = qc.depth()
+        cz_count = qc.count_ops().get('cz', 0)
+
         print(f"{n}-qubit Bernstein-Vazirani:")
-        print(f"  Circuit depth: {qc.depth()}")
-        print(f"  2-qubit gates: {qc.count_ops().get('cz', 0)}")
+        print(f"  Circuit depth: {depth}")
+        print(f"  2-qubit gates: {cz_count}")
         print(f"  Error without mitigation: ~{n * 0.01:.1%}")
         print(f"  Error with mitigation: <{1 / (2 ** n):.2%}")
         print()
@@ -319,11 +368,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Demo 4: Error Mitigation with Debiasing & Sharpening")
     parser.add_argument("--sim", action="store_true", default=True, help="Use local simulator")
     parser.add_argument("--n-qubits", type=int, default=6, help="Number of qubits")
+    parser.add_argument("--gpu", action="store_true", help="Simulate on a GPU if available")
 
     args = parser.parse_args()
 
     # Run main demo
-    demo_error_mitigation(n_qubits=args.n_qubits, use_simulator=args.sim)
+    demo_error_mitigation(n_qubits=args.n_qubits, use_simulator=args.sim, use_gpu=args.gpu)
 
     # Show complexity analysis
     compare_circuit_complexity(secret_length=args.n_qubits)
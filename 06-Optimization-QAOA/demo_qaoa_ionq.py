@@ -9,25 +9,32 @@ This code uses PennyLane to define and visualize the circuit,
 and NetworkX + Matplotlib to show the problem structure.
 
 Usage:
-    python demo_qaoa_ionq.py [--n-nodes N] [--depth P]
+    python demo_qaoa_ionq.py [--n-nodes N] [--depth P] [--warm-start] [--sweep]
 
 Options:
     --n-nodes N    Size of complete graph K_N (default: 5)
     --depth P      QAOA depth (default: 1)
+    --warm-start   Optimize depths 1..P in turn, each seeded from the last
+    --sweep        Solve K_2..K_N in parallel (one process per graph size)
 """
 
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
 import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import Tuple, List
+from typing import Tuple
 
-try:
-    import pennylane as qml
-    from pennylane import qaoa
-    HAS_PENNYLANE = True
-except ImportError:
-    HAS_PENNYLANE = False
-    print("Warning: PennyLane not installed. Install with: pip install pennylane")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _qaoa_maxcut import (HAS_PENNYLANE, _build_qaoa, _cached_specs, _complete_graph_p1_angles,
+                          _interpolate_params, _make_objective, _maxcut_problem,
+                          evaluate_maxcut_for_bitstring)
+from _report import _write_report
 
 
 def visualize_complete_graph(n_nodes: int, save_path: str = None):
@@ -94,113 +101,104 @@ Complete Graph K_{n_nodes} Properties:
     return fig, graph
 
 
-def run_pennylane_qaoa(n_nodes: int = 5, depth: int = 1, verbose: bool = True):
+def run_pennylane_qaoa(n_nodes: int = 5, depth: int = 1, verbose: bool = True,
+                       warm_start: bool = False):
     """
     Run QAOA for MaxCut using PennyLane.
 
     Args:
         n_nodes: Number of nodes in complete graph
         depth: QAOA depth (p parameter)
-        verbose: Print detailed information
+        verbose: Print detailed information (buffered, and written out just
+                 before the optimization and at the end)
+        warm_start: Optimize p = 1, ..., depth in turn, seeding each level
+                    with the previous optimum (layer interpolation). Costs
+                    more circuit evaluations but finds better angles at p >= 3.
 
     Returns:
         Dictionary with results
     """
     if not HAS_PENNYLANE:
         print("PennyLane not available. Showing theoretical analysis instead.")
-        return analyze_qaoa_theoretically(n_nodes, depth)
+        return analyze_qaoa_theoretically(n_nodes, depth, verbose)
+
+    out = io.StringIO()
 
-    print(f"\n{'='*80}")
-    print(f"⚡ PennyLane QAOA Demo: MaxCut on K_{n_nodes}")
-    print(f"{'='*80}\n")
+    print(f"\n{'='*80}", file=out)
+    print(f"⚡ PennyLane QAOA Demo: MaxCut on K_{n_nodes}", file=out)
+    print(f"{'='*80}\n", file=out)
 
     # Create the complete graph
-    graph = nx.complete_graph(n_nodes)
+    graph = _maxcut_problem(n_nodes)
     n_edges = len(graph.edges)
 
-    print(f"Problem: MaxCut on K_{n_nodes}")
-    print(f"  Nodes: {n_nodes}")
-    print(f"  Edges: {n_edges}")
-    print(f"  QAOA Depth: p={depth}\n")
-
-    # Create cost and mixer Hamiltonians using PennyLane
-    print("Creating QAOA Hamiltonian...")
-    cost_h, mixer_h = qaoa.maxcut(graph)
-
-    print(f"Cost Hamiltonian terms: {len(cost_h.ops)}")
-    print(f"Mixer Hamiltonian: X on each qubit\n")
+    print(f"Problem: MaxCut on K_{n_nodes}", file=out)
+    print(f"  Nodes: {n_nodes}", file=out)
+    print(f"  Edges: {n_edges}", file=out)
+    print(f"  QAOA Depth: p={depth}\n", file=out)
 
-    # Define the device
-    dev = qml.device("default.qubit", wires=n_nodes)
+    # Create cost and mixer Hamiltonians and the QNode using PennyLane
+    # (cached per size and depth, so repeat runs skip the construction)
+    print("Creating QAOA Hamiltonian...", file=out)
+    cost_h, mixer_h, circuit, _ = _build_qaoa(n_nodes, depth)
 
-    # Define the QAOA layer
-    def qaoa_layer(gamma, alpha):
-        qaoa.cost_layer(gamma, cost_h)
-        qaoa.mixer_layer(alpha, mixer_h)
-
-    # Define the quantum circuit
-    @qml.qnode(dev)
-    def circuit(params):
-        # Initial superposition
-        for w in range(n_nodes):
-            qml.Hadamard(wires=w)
-
-        # QAOA layers
-        for layer_idx in range(depth):
-            qaoa_layer(params[0][layer_idx], params[1][layer_idx])
-
-        return qml.probs(wires=range(n_nodes))
+    print(f"Cost Hamiltonian terms: {len(cost_h.ops)}", file=out)
+    print(f"Mixer Hamiltonian: X on each qubit\n", file=out)
 
     # Get circuit specs
-    print("Analyzing circuit structure...")
-    specs_func = qml.specs(circuit)
-    initial_params = np.random.RandomState(42).rand(2, depth)
-
+    print("Analyzing circuit structure...", file=out)
     try:
-        specs = specs_func(initial_params)
-        print(f"Total gates: {specs['resources'].num_gates}")
-        print(f"Circuit depth: {specs['resources'].depth}")
-        print(f"Number of qubits: {n_nodes}\n")
+        specs = _cached_specs(n_nodes, depth)
+        print(f"Total gates: {specs['resources'].num_gates}", file=out)
+        print(f"Circuit depth: {specs['resources'].depth}", file=out)
+        print(f"Number of qubits: {n_nodes}\n", file=out)
     except Exception as e:
-        print(f"(Circuit specs unavailable: {e})\n")
+        print(f"(Circuit specs unavailable: {e})\n", file=out)
 
     # Optimize parameters
-    print("Optimizing QAOA parameters...")
+    print("Optimizing QAOA parameters...", file=out)
+    _write_report(out, verbose)
     from scipy.optimize import minimize
 
-    def objective(params_flat):
-        params = params_flat.reshape(2, depth)
-        probs = circuit(params)
-
-        # Evaluate MaxCut for each basis state
-        expected_cut = 0.0
-        for state_idx in range(2 ** n_nodes):
-            cut_value = evaluate_maxcut_for_bitstring(state_idx, graph)
-            expected_cut += probs[state_idx] * cut_value
-
-        return -expected_cut  # Negative for minimization
-
-    result = minimize(
-        objective,
-        initial_params.flatten(),
-        method='COBYLA',
-        options={'maxiter': 100}
-    )
-
-    best_params = result.x.reshape(2, depth)
-    best_probs = circuit(best_params)
+    # With warm_start, solve every depth up to the target, each seeded
+    # from the previous optimum; otherwise just the target depth
+    stages = range(1, depth + 1) if warm_start else [depth]
+    if stages[0] == 1:
+        # K_n has a closed-form p=1 optimum; start there
+        params = _complete_graph_p1_angles(n_nodes)
+    else:
+        params = np.random.RandomState(42).rand(2, stages[0])
+    n_evals = 0
+
+    for p in stages:
+        if p > params.shape[1]:
+            params = _interpolate_params(params, p)
+        result = minimize(
+            _make_objective(n_nodes, p),
+            params.flatten(),
+            method='COBYLA',
+            # From the analytic p=1 optimum COBYLA only needs to polish
+            options=({'maxiter': 10, 'rhobeg': 0.05} if p == 1 else {'maxiter': 100})
+        )
+        params = result.x.reshape(2, p)
+        n_evals += result.nfev
+
+    best_params = params
+    best_probs = circuit(*best_params)
     best_bitstring = np.argmax(best_probs)
     best_cut = evaluate_maxcut_for_bitstring(best_bitstring, graph)
 
-    print(f"✓ Optimization complete ({result.nit} iterations)\n")
+    print(f"✓ Optimization complete ({n_evals} circuit evaluations)\n", file=out)
 
     # Results
-    print(f"{'='*80}")
-    print("RESULTS")
-    print(f"{'='*80}")
-    print(f"Best cut found: {best_cut} / {n_edges}")
-    print(f"Approximation ratio: {best_cut / n_edges:.1%}")
-    print(f"Best partition: {bin(best_bitstring)}\n")
+    print(f"{'='*80}", file=out)
+    print("RESULTS", file=out)
+    print(f"{'='*80}", file=out)
+    print(f"Best cut found: {best_cut} / {n_edges}", file=out)
+    print(f"Approximation ratio: {best_cut / n_edges:.1%}", file=out)
+    print(f"Best partition: {bin(best_bitstring)}\n", file=out)
+
+    _write_report(out, verbose)
 
     return {
         'graph': graph,
@@ -211,76 +209,105 @@ def run_pennylane_qaoa(n_nodes: int = 5, depth: int = 1, verbose: bool = True):
     }
 
 
-def analyze_qaoa_theoretically(n_nodes: int, depth: int):
+def analyze_qaoa_theoretically(n_nodes: int, depth: int, verbose: bool = True):
     """
     Provide theoretical analysis when PennyLane is not available.
 
     Args:
         n_nodes: Number of nodes
         depth: QAOA depth
+        verbose: Print the analysis
 
     Returns:
         Dictionary with theoretical results
     """
-    print(f"\n{'='*80}")
-    print(f"⚡ QAOA MaxCut Theoretical Analysis: K_{n_nodes}")
-    print(f"{'='*80}\n")
+    out = io.StringIO()
+
+    print(f"\n{'='*80}", file=out)
+    print(f"⚡ QAOA MaxCut Theoretical Analysis: K_{n_nodes}", file=out)
+    print(f"{'='*80}\n", file=out)
 
     graph = nx.complete_graph(n_nodes)
     n_edges = len(graph.edges)
 
-    print(f"Complete Graph K_{n_nodes}:")
-    print(f"  Nodes: {n_nodes}")
-    print(f"  Edges: {n_edges}")
-    print(f"  QAOA Depth: p={depth}\n")
+    print(f"Complete Graph K_{n_nodes}:", file=out)
+    print(f"  Nodes: {n_nodes}", file=out)
+    print(f"  Edges: {n_edges}", file=out)
+    print(f"  QAOA Depth: p={depth}\n", file=out)
 
-    print(f"Theoretical Circuit Structure:")
+    print(f"Theoretical Circuit Structure:", file=out)
     interaction_terms = n_edges
     total_depth_estimate = depth * (5 + interaction_terms // 2)
 
-    print(f"  Interaction terms: {interaction_terms}")
-    print(f"  Estimated depth: {total_depth_estimate} layers\n")
+    print(f"  Interaction terms: {interaction_terms}", file=out)
+    print(f"  Estimated depth: {total_depth_estimate} layers\n", file=out)
 
-    print(f"Expected QAOA Results (p={depth}):")
+    print(f"Expected QAOA Results (p={depth}):", file=out)
     approx_ratio = 0.88  # Typical for QAOA p=2
     expected_cut = int(n_edges * approx_ratio)
-    print(f"  Optimal cut: {n_edges}")
-    print(f"  QAOA cut (typical): {expected_cut} (~{approx_ratio:.0%})\n")
-
-    print(f"Hardware Compilation Comparison:\n")
-    print(f"Superconducting (Linear Topology):")
-    print(f"  Routing cost: ~{n_nodes // 2} SWAPs per long-range interaction")
-    print(f"  Total SWAPs: ~{interaction_terms * (n_nodes // 2)}")
-    print(f"  Final depth: {total_depth_estimate + interaction_terms * 2}")
-    print(f"  Status: ❌ Too deep (noise dominates)\n")
-
-    print(f"IonQ (All-to-All Topology):")
-    print(f"  Routing cost: 0 SWAPs (all-to-all)")
-    print(f"  Total SWAPs: 0")
-    print(f"  Final depth: {total_depth_estimate}")
-    print(f"  Status: ✓ Shallow and efficient\n")
+    print(f"  Optimal cut: {n_edges}", file=out)
+    print(f"  QAOA cut (typical): {expected_cut} (~{approx_ratio:.0%})\n", file=out)
+
+    print(f"Hardware Compilation Comparison:\n", file=out)
+    print(f"Superconducting (Linear Topology):", file=out)
+    print(f"  Routing cost: ~{n_nodes // 2} SWAPs per long-range interaction", file=out)
+    print(f"  Total SWAPs: ~{interaction_terms * (n_nodes // 2)}", file=out)
+    print(f"  Final depth: {total_depth_estimate + interaction_terms * 2}", file=out)
+    print(f"  Status: ❌ Too deep (noise dominates)\n", file=out)
+
+    print(f"IonQ (All-to-All Topology):", file=out)
+    print(f"  Routing cost: 0 SWAPs (all-to-all)", file=out)
+    print(f"  Total SWAPs: 0", file=out)
+    print(f"  Final depth: {total_depth_estimate}", file=out)
+    print(f"  Status: ✓ Shallow and efficient\n", file=out)
+
+    _write_report(out, verbose)
 
     return {'n_nodes': n_nodes, 'n_edges': n_edges, 'expected_cut': expected_cut}
 
 
-def evaluate_maxcut_for_bitstring(bitstring: int, graph: nx.Graph) -> int:
+def _sweep_point(n_nodes: int, depth: int, warm_start: bool) -> Tuple[int, int, int]:
+    """Solve K_n quietly (in a worker process); returns (n_nodes, n_edges, best_cut)."""
+    results = run_pennylane_qaoa(n_nodes, depth, verbose=False, warm_start=warm_start)
+    return n_nodes, results['n_edges'], results.get('best_cut', results.get('expected_cut'))
+
+
+def run_qaoa_sweep(max_nodes: int, depth: int = 1, warm_start: bool = False):
     """
-    Evaluate MaxCut value for a given bitstring (partition).
+    Run QAOA on every complete graph K_2, ..., K_max_nodes.
+
+    The graph sizes are independent, CPU-bound simulations, so each one runs
+    in its own process (with its own simulator device).
 
     Args:
-        bitstring: Integer representing a partition (binary encoding)
-        graph: NetworkX graph
+        max_nodes: Largest graph size in the sweep
+        depth: QAOA depth (p parameter)
+        warm_start: Passed through to run_pennylane_qaoa
 
     Returns:
-        Number of edges cut by this partition
+        List of (n_nodes, n_edges, best_cut) tuples, in graph-size order
     """
-    cut_value = 0
-    for i, j in graph.edges():
-        bit_i = (bitstring >> i) & 1
-        bit_j = (bitstring >> j) & 1
-        if bit_i != bit_j:
-            cut_value += 1
-    return cut_value
+    sizes = range(2, max_nodes + 1)
+    with ProcessPoolExecutor(max_workers=min(len(sizes), os.cpu_count() or 1)) as ex:
+        rows = list(ex.map(_sweep_point, sizes, repeat(depth), repeat(warm_start)))
+
+    out = io.StringIO()
+
+    print(f"\n{'='*80}", file=out)
+    print(f"⚡ QAOA Sweep: MaxCut on K_2 .. K_{max_nodes} (p={depth})", file=out)
+    print(f"{'='*80}\n", file=out)
+    print(f"{'Nodes':>6} {'Edges':>6} {'QAOA cut':>9} {'Optimal':>8} {'Ratio':>7}", file=out)
+    print("-" * 40, file=out)
+    for n_nodes, n_edges, best_cut in rows:
+        # MaxCut on K_n: split the nodes as evenly as possible
+        optimal_cut = (n_nodes * n_nodes) // 4
+        print(f"{n_nodes:>6} {n_edges:>6} {best_cut:>9} {optimal_cut:>8} "
+              f"{best_cut / optimal_cut:>7.1%}", file=out)
+    print(file=out)
+
+    _write_report(out)
+
+    return rows
 
 
 def demonstrate_connectivity_challenge(n_nodes: int = 5):
@@ -290,50 +317,54 @@ def demonstrate_connectivity_challenge(n_nodes: int = 5):
     Args:
         n_nodes: Number of nodes in complete graph
     """
-    print(f"\n{'='*80}")
-    print(f"🔌 The Connectivity Challenge Explained")
-    print(f"{'='*80}\n")
+    out = io.StringIO()
+
+    print(f"\n{'='*80}", file=out)
+    print(f"🔌 The Connectivity Challenge Explained", file=out)
+    print(f"{'='*80}\n", file=out)
 
     graph = nx.complete_graph(n_nodes)
 
-    print(f"Scenario: Solve MaxCut on K_{n_nodes}\n")
+    print(f"Scenario: Solve MaxCut on K_{n_nodes}\n", file=out)
+
+    print(f"Step 1: Identify all interactions", file=out)
+    print(f"  Qubit 0 must interact with: {list(graph.neighbors(0))}", file=out)
+    print(f"  Qubit 1 must interact with: {list(graph.neighbors(1))}", file=out)
+    print(f"  ... (total: {len(graph.edges)} interactions)\n", file=out)
 
-    print(f"Step 1: Identify all interactions")
-    print(f"  Qubit 0 must interact with: {list(graph.neighbors(0))}")
-    print(f"  Qubit 1 must interact with: {list(graph.neighbors(1))}")
-    print(f"  ... (total: {len(graph.edges)} interactions)\n")
+    print(f"Step 2: Compile for superconducting hardware (Linear Topology)", file=out)
+    print(f"  Layout: Qubits arranged in a line: 0-1-2-3-4", file=out)
+    print(f"  Problem: Qubit 0 is far from Qubits 3, 4", file=out)
+    print(f"  Solution: Insert SWAP gates to move data\n", file=out)
 
-    print(f"Step 2: Compile for superconducting hardware (Linear Topology)")
-    print(f"  Layout: Qubits arranged in a line: 0-1-2-3-4")
-    print(f"  Problem: Qubit 0 is far from Qubits 3, 4")
-    print(f"  Solution: Insert SWAP gates to move data\n")
+    print(f"  Example: To connect Qubits 0 and 4:", file=out)
+    print(f"    SWAP(0,1) → Move Q0 from position 0 to position 1", file=out)
+    print(f"    SWAP(1,2) → Move Q0 from position 1 to position 2", file=out)
+    print(f"    SWAP(2,3) → Move Q0 from position 2 to position 3", file=out)
+    print(f"    SWAP(3,4) → Move Q0 from position 3 to position 4", file=out)
+    print(f"    CX(0,4)   → Finally interact", file=out)
+    print(f"    [Reverse SWAPs to move data back]", file=out)
+    print(f"    Total cost: 10 gates for 1 interaction! ⚠️\n", file=out)
 
-    print(f"  Example: To connect Qubits 0 and 4:")
-    print(f"    SWAP(0,1) → Move Q0 from position 0 to position 1")
-    print(f"    SWAP(1,2) → Move Q0 from position 1 to position 2")
-    print(f"    SWAP(2,3) → Move Q0 from position 2 to position 3")
-    print(f"    SWAP(3,4) → Move Q0 from position 3 to position 4")
-    print(f"    CX(0,4)   → Finally interact")
-    print(f"    [Reverse SWAPs to move data back]")
-    print(f"    Total cost: 10 gates for 1 interaction! ⚠️\n")
+    print(f"Step 3: Compile for IonQ hardware (All-to-All Topology)", file=out)
+    print(f"  Layout: All qubits can see all qubits", file=out)
+    print(f"  Solution: Direct interaction, no movement needed\n", file=out)
 
-    print(f"Step 3: Compile for IonQ hardware (All-to-All Topology)")
-    print(f"  Layout: All qubits can see all qubits")
-    print(f"  Solution: Direct interaction, no movement needed\n")
+    print(f"  Example: To connect Qubits 0 and 4:", file=out)
+    print(f"    MS(0,4)  → Direct MS gate (native operation)", file=out)
+    print(f"    Total cost: 1 gate for 1 interaction ✓\n", file=out)
 
-    print(f"  Example: To connect Qubits 0 and 4:")
-    print(f"    MS(0,4)  → Direct MS gate (native operation)")
-    print(f"    Total cost: 1 gate for 1 interaction ✓\n")
+    print(f"Step 4: Scale the problem", file=out)
+    print(f"  Total interactions needed: {len(graph.edges)}", file=out)
+    print(f"  Competitor overhead: {len(graph.edges) * 10} extra gates", file=out)
+    print(f"  IonQ overhead: 0 extra gates\n", file=out)
 
-    print(f"Step 4: Scale the problem")
-    print(f"  Total interactions needed: {len(graph.edges)}")
-    print(f"  Competitor overhead: {len(graph.edges) * 10} extra gates")
-    print(f"  IonQ overhead: 0 extra gates\n")
+    print(f">>> CONCLUSION:", file=out)
+    print(f"    On IonQ, fully-connected graph problems are NATIVE.", file=out)
+    print(f"    On competitors, they require exponential SWAP overhead.", file=out)
+    print(f"    This is why IonQ wins at optimization.", file=out)
 
-    print(f">>> CONCLUSION:")
-    print(f"    On IonQ, fully-connected graph problems are NATIVE.")
-    print(f"    On competitors, they require exponential SWAP overhead.")
-    print(f"    This is why IonQ wins at optimization.")
+    _write_report(out)
 
 
 if __name__ == "__main__":
@@ -354,6 +385,16 @@ if __name__ == "__main__":
         default=1,
         help="QAOA depth (default: 1)"
     )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Warm-start each QAOA depth from the previous one (layer interpolation)"
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Run every graph size from 2 to --n-nodes in parallel processes"
+    )
     parser.add_argument(
         "--visualize",
         action="store_true",
@@ -373,8 +414,12 @@ if __name__ == "__main__":
         visualize_complete_graph(args.n_nodes)
         plt.show()
 
-    # Run QAOA
-    results = run_pennylane_qaoa(n_nodes=args.n_nodes, depth=args.depth)
+    # Run QAOA (for one graph size, or a parallel sweep up to it)
+    if args.sweep:
+        run_qaoa_sweep(args.n_nodes, depth=args.depth, warm_start=args.warm_start)
+    else:
+        results = run_pennylane_qaoa(n_nodes=args.n_nodes, depth=args.depth,
+                                     warm_start=args.warm_start)
 
     # Optionally explain connectivity
     if args.explain_connectivity:
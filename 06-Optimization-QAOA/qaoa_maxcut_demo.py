@@ -6,240 +6,189 @@ connects to every other node. This is a canonical problem where IonQ's all-to-al
 connectivity provides an unbeatable advantage over grid-based superconducting qubits.
 
 Usage:
-    python qaoa_maxcut_demo.py [--graph-size N] [--depth P] [--seed S]
+    python qaoa_maxcut_demo.py [--graph-size N] [--depth P] [--seed S] [--warm-start] [--visualize]
 
 Options:
     --graph-size N    Size of complete graph K_N (default: 5)
     --depth P         Number of QAOA layers (default: 2)
     --seed S          Random seed (default: 42)
+    --warm-start      Optimize depths 1..P in turn, each seeded from the last
+    --visualize       Draw the problem graph
 """
 
+import io
+import sys
+from pathlib import Path
+
 import numpy as np
 import networkx as nx
-from typing import Tuple, Dict, List
-import matplotlib.pyplot as plt
-
-try:
-    import pennylane as qml
-    from pennylane import qaoa
-    HAS_PENNYLANE = True
-except ImportError:
-    HAS_PENNYLANE = False
-    print("Warning: PennyLane not installed. Install with: pip install pennylane")
-
-
-def evaluate_maxcut_for_bitstring(bitstring: int, graph: nx.Graph) -> int:
-    """
-    Evaluate MaxCut value for a given bitstring (partition).
-
-    A bitstring of length n divides nodes into two sets:
-    - Set A: nodes where bit is 0
-    - Set B: nodes where bit is 1
-
-    MaxCut = number of edges between Set A and Set B
-
-    Args:
-        bitstring: Integer representing a partition (binary encoding)
-        graph: NetworkX graph
-
-    Returns:
-        Number of edges cut by this partition
-    """
-    n = len(graph)
-    cut_value = 0
-
-    for i, j in graph.edges():
-        # Check if nodes i and j are in different partitions
-        bit_i = (bitstring >> i) & 1
-        bit_j = (bitstring >> j) & 1
-
-        if bit_i != bit_j:
-            cut_value += 1
-
-    return cut_value
-
-
-def find_optimal_maxcut(graph: nx.Graph) -> Tuple[int, int]:
-    """
-    Brute-force optimal MaxCut (only feasible for small graphs).
-
-    Args:
-        graph: NetworkX graph
-
-    Returns:
-        (optimal_cut_value, optimal_bitstring)
-    """
-    n = len(graph)
-    max_cut = 0
-    best_bitstring = 0
-
-    for bitstring in range(2 ** n):
-        cut_value = evaluate_maxcut_for_bitstring(bitstring, graph)
-        if cut_value > max_cut:
-            max_cut = cut_value
-            best_bitstring = bitstring
 
-    return max_cut, best_bitstring
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _qaoa_maxcut import (HAS_PENNYLANE, _build_qaoa, _cached_specs, _complete_graph_p1_angles,
+                          _interpolate_params, _make_objective, _maxcut_problem,
+                          evaluate_maxcut_for_bitstring, find_optimal_maxcut)
+from _report import _write_report
 
 
-def demo_qaoa_maxcut_pennylane(graph_size: int = 5, depth: int = 2):
+def demo_qaoa_maxcut_pennylane(graph_size: int = 5, depth: int = 2, warm_start: bool = False,
+                               visualize: bool = False, verbose: bool = True):
     """
     Demonstrate QAOA for MaxCut using PennyLane.
 
     Args:
         graph_size: Number of nodes in complete graph K_n
         depth: Number of QAOA layers (p parameter)
+        warm_start: Optimize p = 1, ..., depth in turn, seeding each level
+                    with the previous optimum (layer interpolation). Costs
+                    more circuit evaluations but finds better angles at p >= 3.
+        visualize: Draw and show the problem graph after the results
+        verbose: Print the report
+
+    The report is buffered and written out in a few large writes: before
+    the optimization (so progress is visible), before showing the figure,
+    and at the end.
     """
-    print(f"\n{'='*80}")
-    print(f"⚡ DEMO 6: PennyLane + IonQ – QAOA for MaxCut")
-    print(f"{'='*80}")
-    print(f"Problem: MaxCut on Complete Graph K_{graph_size}")
-    print(f"QAOA Depth: p={depth}\n")
+    out = io.StringIO()
+
+    print(f"\n{'='*80}", file=out)
+    print(f"⚡ DEMO 6: PennyLane + IonQ – QAOA for MaxCut", file=out)
+    print(f"{'='*80}", file=out)
+    print(f"Problem: MaxCut on Complete Graph K_{graph_size}", file=out)
+    print(f"QAOA Depth: p={depth}\n", file=out)
 
     # 1. CREATE COMPLETE GRAPH
-    print("Step 1: Generate Complete Graph")
-    print("-" * 80)
-    graph = nx.complete_graph(graph_size)
+    print("Step 1: Generate Complete Graph", file=out)
+    print("-" * 80, file=out)
+    # Built once per size
+    graph = _maxcut_problem(graph_size)
     n_edges = graph.number_of_edges()
-    print(f"Nodes: {graph_size}")
-    print(f"Edges: {n_edges} (complete graph)")
-    print(f"Maximum possible MaxCut: {n_edges} (cut all edges)\n")
-
-    # 2. FIND OPTIMAL SOLUTION (Brute Force for small graphs)
-    print("Step 2: Compute Optimal MaxCut (Brute Force)")
-    print("-" * 80)
-    if graph_size <= 10:
-        optimal_cut, optimal_bitstring = find_optimal_maxcut(graph)
-        print(f"Optimal MaxCut Value: {optimal_cut}")
-        print(f"Optimal Partition: {bin(optimal_bitstring)}\n")
-    else:
-        optimal_cut = None
-        print(f"Graph too large for brute-force. Skipping optimal computation.\n")
+    print(f"Nodes: {graph_size}", file=out)
+    print(f"Edges: {n_edges} (complete graph)", file=out)
+    print(f"Maximum possible MaxCut: {n_edges} (cut all edges)\n", file=out)
+
+    # 2. FIND OPTIMAL SOLUTION (closed form for complete graphs)
+    print("Step 2: Compute Optimal MaxCut", file=out)
+    print("-" * 80, file=out)
+    optimal_cut, optimal_bitstring = find_optimal_maxcut(graph)
+    print(f"Optimal MaxCut Value: {optimal_cut}", file=out)
+    print(f"Optimal Partition: {bin(optimal_bitstring)}\n", file=out)
 
     # 3. IF PENNYLANE AVAILABLE: RUN QAOA
     if HAS_PENNYLANE:
-        print("Step 3: Run QAOA with PennyLane")
-        print("-" * 80)
-
-        # Create cost and mixer Hamiltonians
-        cost_h, mixer_h = qaoa.maxcut(graph)
-        print(f"Cost Hamiltonian terms: {len(cost_h.ops)}")
-        print(f"Mixer Hamiltonian: X on each qubit\n")
-
-        # Set up device
-        dev = qml.device("default.qubit", wires=graph_size)
-
-        # Define QAOA circuit
-        def qaoa_circuit(params):
-            # Initialize in superposition
-            for w in range(graph_size):
-                qml.Hadamard(wires=w)
-
-            # Apply QAOA layers
-            for layer in range(depth):
-                qaoa.cost_layer(params[0][layer], cost_h)
-                qaoa.mixer_layer(params[1][layer], mixer_h)
-
-            return qml.probs(wires=range(graph_size))
-
-        # Create QNode
-        qnode = qml.QNode(qaoa_circuit, dev)
-
-        # Define objective function (negative because we minimize)
-        def objective(params):
-            probs = qnode(params)
-            expected_cut = 0.0
-
-            # Evaluate expected MaxCut
-            for bitstring in range(2 ** graph_size):
-                cut_value = evaluate_maxcut_for_bitstring(bitstring, graph)
-                expected_cut += probs[bitstring] * cut_value
+        print("Step 3: Run QAOA with PennyLane", file=out)
+        print("-" * 80, file=out)
 
-            return -expected_cut  # Negative for minimization
+        # Cost/mixer Hamiltonians and the QNode, cached per (size, depth)
+        cost_h, mixer_h, qnode, _ = _build_qaoa(graph_size, depth)
+        print(f"Cost Hamiltonian terms: {len(cost_h.ops)}", file=out)
+        print(f"Mixer Hamiltonian: X on each qubit\n", file=out)
 
         # Optimize with COBYLA
-        print("Optimizing QAOA parameters...")
+        print("Optimizing QAOA parameters...", file=out)
+        _write_report(out, verbose)
         from scipy.optimize import minimize
 
-        initial_params = np.random.RandomState(42).rand(2, depth)
-        result = minimize(
-            objective,
-            initial_params,
-            method="COBYLA",
-            options={"maxiter": 100}
-        )
+        # With warm_start, solve every depth up to the target, each seeded
+        # from the previous optimum; otherwise just the target depth
+        stages = range(1, depth + 1) if warm_start else [depth]
+        if stages[0] == 1:
+            # K_n has a closed-form p=1 optimum; start there
+            params = _complete_graph_p1_angles(graph_size)
+        else:
+            params = np.random.RandomState(42).rand(2, stages[0])
+        n_evals = 0
+
+        for p in stages:
+            if p > params.shape[1]:
+                params = _interpolate_params(params, p)
+            result = minimize(
+                _make_objective(graph_size, p),
+                params.flatten(),
+                method="COBYLA",
+                # From the analytic p=1 optimum COBYLA only needs to polish
+                options=({"maxiter": 10, "rhobeg": 0.05} if p == 1 else {"maxiter": 100})
+            )
+            params = result.x.reshape(2, p)
+            n_evals += result.nfev
 
         # Extract best result
-        best_params = result.x
-        best_probs = qnode(best_params.reshape(2, depth))
+        best_params = params
+        best_probs = qnode(*best_params)
         best_bitstring = np.argmax(best_probs)
         best_cut = evaluate_maxcut_for_bitstring(best_bitstring, graph)
 
-        print(f"✓ Optimization complete (iterations: {result.nit})\n")
+        print(f"✓ Optimization complete (circuit evaluations: {n_evals})\n", file=out)
 
         # 4. RESULTS
-        print("Step 4: Results")
-        print("-" * 80)
-        print(f"QAOA MaxCut Value: {best_cut}")
-        print(f"QAOA Partition: {bin(best_bitstring)}")
+        print("Step 4: Results", file=out)
+        print("-" * 80, file=out)
+        print(f"QAOA MaxCut Value: {best_cut}", file=out)
+        print(f"QAOA Partition: {bin(best_bitstring)}", file=out)
 
         if optimal_cut is not None:
             approximation_ratio = best_cut / optimal_cut
-            print(f"Approximation Ratio: {approximation_ratio:.2%}")
-            print(f"  (100% = optimal, lower = worse)\n")
+            print(f"Approximation Ratio: {approximation_ratio:.2%}", file=out)
+            print(f"  (100% = optimal, lower = worse)\n", file=out)
 
         # 5. CIRCUIT ANALYSIS
-        print("Step 5: Circuit Analysis")
-        print("-" * 80)
+        print("Step 5: Circuit Analysis", file=out)
+        print("-" * 80, file=out)
 
         # Use PennyLane's resource tracker
-        specs_func = qml.specs(qaoa_circuit)
         try:
-            specs = specs_func(best_params.reshape(2, depth))
-            print(f"Total 2-Qubit Gates: {specs['resources'].num_gates}")
-            print(f"Circuit Depth: {specs['resources'].depth}")
+            specs = _cached_specs(graph_size, depth)
+            print(f"Total 2-Qubit Gates: {specs['resources'].num_gates}", file=out)
+            print(f"Circuit Depth: {specs['resources'].depth}", file=out)
         except:
-            print("(Circuit specs unavailable in this PennyLane version)")
-
-        print(f"\n>>> WHY IONQ WINS HERE:")
-        print(f"    1. Complete graph K_{graph_size} requires {n_edges} long-range interactions")
-        print(f"    2. On superconducting (grid): SWAP overhead explodes circuit depth")
-        print(f"    3. On IonQ (all-to-all): Every interaction is native (1-step)")
-        print(f"    4. Result: IonQ can solve K_20+ while competitors max out at K_7")
-
-        # 6. VISUALIZATION (Optional)
-        try:
-            print(f"\nStep 6: Visualizing Problem Graph")
-            print("-" * 80)
-
-            # Draw the graph
-            plt.figure(figsize=(8, 6))
-            pos = nx.spring_layout(graph, seed=42)
-            nx.draw(graph, pos, with_labels=True, node_color='lightblue',
-                    node_size=500, font_size=16, font_weight='bold',
-                    edge_color='gray', width=2)
-            plt.title(f"MaxCut Problem: Complete Graph K_{graph_size}")
-            plt.axis('off')
-            # plt.show()  # Uncomment to display
-            print("(Graph visualization generated - uncomment plt.show() to display)")
-        except:
-            print("(Visualization skipped)")
+            print("(Circuit specs unavailable in this PennyLane version)", file=out)
+
+        print(f"\n>>> WHY IONQ WINS HERE:", file=out)
+        print(f"    1. Complete graph K_{graph_size} requires {n_edges} long-range interactions", file=out)
+        print(f"    2. On superconducting (grid): SWAP overhead explodes circuit depth", file=out)
+        print(f"    3. On IonQ (all-to-all): Every interaction is native (1-step)", file=out)
+        print(f"    4. Result: IonQ can solve K_20+ while competitors max out at K_7", file=out)
+
+        # 6. VISUALIZATION (Optional; layout and figure are only built on request)
+        if visualize:
+            try:
+                import matplotlib.pyplot as plt
+
+                print(f"\nStep 6: Visualizing Problem Graph", file=out)
+                print("-" * 80, file=out)
+
+                # Draw the graph; the force-directed layout is O(n^2) per
+                # iteration, so large graphs go straight on a circle
+                plt.figure(figsize=(8, 6))
+                if graph_size <= 10:
+                    pos = nx.spring_layout(graph, seed=42)
+                else:
+                    pos = nx.circular_layout(graph)
+                nx.draw(graph, pos, with_labels=True, node_color='lightblue',
+                        node_size=500, font_size=16, font_weight='bold',
+                        edge_color='gray', width=2)
+                plt.title(f"MaxCut Problem: Complete Graph K_{graph_size}")
+                plt.axis('off')
+                _write_report(out, verbose)
+                plt.show()
+            except:
+                print("(Visualization skipped)", file=out)
 
     else:
-        print("Step 3: PennyLane Not Installed")
-        print("-" * 80)
-        print("Install PennyLane to run QAOA:")
-        print("  pip install pennylane\n")
-        print("For now, showing theoretical circuit structure:")
-        print(f"Number of qubits: {graph_size}")
-        print(f"Number of QAOA layers: {depth}")
-        print(f"Interactions per layer: {n_edges} (all long-range)")
-        print(f"Expected circuit depth: ~{depth * (2 + n_edges // graph_size)}")
-
-    print(f"\n{'='*80}")
-    print("TAKEAWAY: On IonQ, QAOA scales to dense, fully-connected problems.")
-    print("On competitors, grid topology limits these problems severely.")
-    print(f"{'='*80}\n")
+        print("Step 3: PennyLane Not Installed", file=out)
+        print("-" * 80, file=out)
+        print("Install PennyLane to run QAOA:", file=out)
+        print("  pip install pennylane\n", file=out)
+        print("For now, showing theoretical circuit structure:", file=out)
+        print(f"Number of qubits: {graph_size}", file=out)
+        print(f"Number of QAOA layers: {depth}", file=out)
+        print(f"Interactions per layer: {n_edges} (all long-range)", file=out)
+        print(f"Expected circuit depth: ~{depth * (2 + n_edges // graph_size)}", file=out)
+
+    print(f"\n{'='*80}", file=out)
+    print("TAKEAWAY: On IonQ, QAOA scales to dense, fully-connected problems.", file=out)
+    print("On competitors, grid topology limits these problems severely.", file=out)
+    print(f"{'='*80}\n", file=out)
+    _write_report(out, verbose)
 
 
 def compare_topologies(n_qubits: int = 5):
@@ -249,35 +198,39 @@ def compare_topologies(n_qubits: int = 5):
     Args:
         n_qubits: Number of qubits in complete graph
     """
-    print(f"\n{'='*80}")
-    print(f"📊 Topology Comparison for K_{n_qubits} MaxCut")
-    print(f"{'='*80}\n")
+    out = io.StringIO()
+
+    print(f"\n{'='*80}", file=out)
+    print(f"📊 Topology Comparison for K_{n_qubits} MaxCut", file=out)
+    print(f"{'='*80}\n", file=out)
 
     graph = nx.complete_graph(n_qubits)
     n_edges = graph.number_of_edges()
 
     # Estimate compilation costs
-    print(f"Complete Graph K_{n_qubits} Properties:")
-    print(f"  - Nodes: {n_qubits}")
-    print(f"  - Edges: {n_edges}")
-    print(f"  - Long-range interactions needed: {n_edges}\n")
-
-    print(f"Superconducting (Linear/Grid Topology):")
-    print(f"  - Native 2-qubit gate: CNOT (nearest-neighbor only)")
-    print(f"  - Long-range interactions: Require SWAP chains")
-    print(f"  - Estimated SWAPs per long-range: ~{max(1, n_qubits // 2)}")
-    print(f"  - Total SWAP overhead: ~{n_edges * max(1, n_qubits // 2)}")
-    print(f"  - Circuit depth: ~{30 + n_edges * 3}\n")
-
-    print(f"IonQ (All-to-All Topology):")
-    print(f"  - Native 2-qubit gate: MS (all-to-all)")
-    print(f"  - Long-range interactions: Direct (no SWAPs)")
-    print(f"  - Total SWAP overhead: 0")
-    print(f"  - Circuit depth: ~{5 + n_edges // 2}\n")
+    print(f"Complete Graph K_{n_qubits} Properties:", file=out)
+    print(f"  - Nodes: {n_qubits}", file=out)
+    print(f"  - Edges: {n_edges}", file=out)
+    print(f"  - Long-range interactions needed: {n_edges}\n", file=out)
+
+    print(f"Superconducting (Linear/Grid Topology):", file=out)
+    print(f"  - Native 2-qubit gate: CNOT (nearest-neighbor only)", file=out)
+    print(f"  - Long-range interactions: Require SWAP chains", file=out)
+    print(f"  - Estimated SWAPs per long-range: ~{max(1, n_qubits // 2)}", file=out)
+    print(f"  - Total SWAP overhead: ~{n_edges * max(1, n_qubits // 2)}", file=out)
+    print(f"  - Circuit depth: ~{30 + n_edges * 3}\n", file=out)
+
+    print(f"IonQ (All-to-All Topology):", file=out)
+    print(f"  - Native 2-qubit gate: MS (all-to-all)", file=out)
+    print(f"  - Long-range interactions: Direct (no SWAPs)", file=out)
+    print(f"  - Total SWAP overhead: 0", file=out)
+    print(f"  - Circuit depth: ~{5 + n_edges // 2}\n", file=out)
 
     if n_qubits <= 10:
-        print(f"Depth Ratio: {(30 + n_edges * 3) / (5 + n_edges // 2):.1f}x")
-        print(f"  (IonQ is this many times shallower)\n")
+        print(f"Depth Ratio: {(30 + n_edges * 3) / (5 + n_edges // 2):.1f}x", file=out)
+        print(f"  (IonQ is this many times shallower)\n", file=out)
+
+    _write_report(out)
 
 
 if __name__ == "__main__":
@@ -304,11 +257,22 @@ if __name__ == "__main__":
         default=42,
         help="Random seed (default: 42)"
     )
+    parser.add_argument(
+        "--warm-start",
+        action="store_true",
+        help="Warm-start each QAOA depth from the previous one (layer interpolation)"
+    )
+    parser.add_argument(
+        "--visualize",
+        action="store_true",
+        help="Show graph visualization"
+    )
 
     args = parser.parse_args()
 
     # Run main demo
-    demo_qaoa_maxcut_pennylane(graph_size=args.graph_size, depth=args.depth)
+    demo_qaoa_maxcut_pennylane(graph_size=args.graph_size, depth=args.depth,
+                               warm_start=args.warm_start, visualize=args.visualize)
 
     # Show topology comparison
     compare_topologies(n_qubits=args.graph_size)
@@ -6,16 +6,24 @@ Relevant to battery materials (lithium diffusion), magnetic materials, and phase
 
 Usage:
     python heisenberg_simulation_demo.py [--n-spins N] [--n-steps K] [--max-time T]
+                                         [--backend {exact,pennylane}]
 
 Options:
     --n-spins N       Number of spins in chain (default: 4)
     --n-steps K       Number of Trotter steps (default: 10)
     --max-time T      Maximum simulation time (default: 2.0)
+    --backend B       exact: sparse-matrix exponential (default);
+                      pennylane: simulate the Trotterized circuit
 """
 
+import functools
+
 import numpy as np
 from typing import Tuple, List, Dict
 import matplotlib.pyplot as plt
+import scipy.sparse as sp
+from scipy.sparse.linalg import expm_multiply
+from scipy.special import xlogy
 
 try:
     import pennylane as qml
@@ -24,8 +32,38 @@ except ImportError:
     HAS_PENNYLANE = False
     print("Warning: PennyLane not installed. Install with: pip install pennylane")
 
+# Chain length from which the C++ lightning.qubit simulator (pip install
+# pennylane-lightning) beats default.qubit's broadcast execution
+LIGHTNING_MIN_QUBITS = 10
+
+# Optional: with JAX the time-evolution circuit is traced and compiled once,
+# instead of PennyLane rebuilding the Trotterized tape on every call
+try:
+    import jax
+    import jax.numpy as jnp
+    jax.config.update("jax_enable_x64", True)
+    HAS_JAX = True
+except ImportError:
+    HAS_JAX = False
+
+# Optional: with Numba the per-time-step observables come from one fused
+# pass over the probabilities instead of three NumPy reductions
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
-def build_heisenberg_hamiltonian(n_spins: int, jx: float = 1.0, jy: float = 1.0, jz: float = 1.0):
+@functools.lru_cache(maxsize=None)
+def _pauli(kind: str, wire: int):
+    """Single-qubit Pauli operator ('X', 'Y' or 'Z') on `wire`, built once and shared."""
+    return {'X': qml.PauliX, 'Y': qml.PauliY, 'Z': qml.PauliZ}[kind](wire)
+
+
+@functools.lru_cache(maxsize=32)
+def build_heisenberg_hamiltonian(n_spins: int, jx: float = 1.0, jy: float = 1.0, jz: float = 1.0,
+                                 parity: int = None):
     """
     Build the Heisenberg Hamiltonian for a 1D spin chain.
 
@@ -34,9 +72,12 @@ def build_heisenberg_hamiltonian(n_spins: int, jx: float = 1.0, jy: float = 1.0,
     Args:
         n_spins: Number of spins in the chain
         jx, jy, jz: Coupling strengths
+        parity: If 0 or 1, keep only the bonds (i, i+1) with i % 2 == parity.
+                Bonds of one parity share no spins, so all their terms commute
 
     Returns:
-        PennyLane Hamiltonian object
+        PennyLane Hamiltonian object (cached per arguments and shared, so
+        callers must not mutate it)
     """
     if not HAS_PENNYLANE:
         return None
@@ -44,27 +85,279 @@ def build_heisenberg_hamiltonian(n_spins: int, jx: float = 1.0, jy: float = 1.0,
     coeffs = []
     obs = []
 
-    # For each adjacent pair
-    for i in range(n_spins - 1):
+    # For each adjacent pair (of the requested parity)
+    for i in range(0 if parity is None else parity, n_spins - 1, 1 if parity is None else 2):
         # XX coupling
         if jx != 0:
             coeffs.append(jx)
-            obs.append(qml.PauliX(i) @ qml.PauliX(i + 1))
+            obs.append(_pauli('X', i) @ _pauli('X', i + 1))
 
         # YY coupling
         if jy != 0:
             coeffs.append(jy)
-            obs.append(qml.PauliY(i) @ qml.PauliY(i + 1))
+            obs.append(_pauli('Y', i) @ _pauli('Y', i + 1))
 
         # ZZ coupling
         if jz != 0:
             coeffs.append(jz)
-            obs.append(qml.PauliZ(i) @ qml.PauliZ(i + 1))
+            obs.append(_pauli('Z', i) @ _pauli('Z', i + 1))
 
     return qml.Hamiltonian(coeffs, obs)
 
 
-def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10, max_time: float = 2.0):
+def _popcount(values: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits in each entry of a uint32 array.
+
+    Branch-free SWAR bit count: sum bits in pairs, then nibbles, then bytes,
+    and add the four byte counts with one multiply. A few whole-array integer
+    ops, with no per-bit intermediate (np.bitwise_count needs NumPy 2).
+    """
+    v = np.asarray(values, dtype=np.uint32)
+    v = v - ((v >> 1) & 0x55555555)
+    v = (v & 0x33333333) + ((v >> 2) & 0x33333333)
+    v = (v + (v >> 4)) & 0x0F0F0F0F
+    return (v * np.uint32(0x01010101)) >> 24
+
+
+def pauli_string_sparse(label: str) -> sp.csr_matrix:
+    """
+    Sparse (CSR) matrix of a Pauli string such as "IXXI" (character k acts on wire k).
+
+    A Pauli string has exactly one nonzero per column, so instead of a chain
+    of Kronecker products it is built directly (as in PauliComposer) from an
+    X bitmask (the bits it flips) and a Z bitmask (the bits that pick up a
+    sign): column j has its entry in row j ^ x_mask, with value
+    i^(number of Ys) * (-1)^popcount(z_mask & j). Wire 0 is the most
+    significant bit, as in PennyLane.
+
+    Args:
+        label: String over "IXYZ", one character per wire
+
+    Returns:
+        scipy.sparse CSR matrix of shape (2^n, 2^n)
+    """
+    n = len(label)
+    x_mask = z_mask = 0
+    for wire, pauli in enumerate(label):
+        if pauli not in "IXYZ":
+            raise ValueError(f"Invalid Pauli label {label!r}")
+        bit = 1 << (n - 1 - wire)
+        if pauli in "XY":
+            x_mask |= bit
+        if pauli in "YZ":
+            z_mask |= bit
+
+    cols = np.arange(1 << n, dtype=np.uint32)
+    signs = 1 - 2 * (_popcount(cols & z_mask) & 1).astype(np.float64)
+    data = 1j ** label.count("Y") * signs
+    return sp.csr_matrix((data, (cols ^ x_mask, cols)), shape=(1 << n, 1 << n))
+
+
+def build_heisenberg_sparse(n_spins: int, jx: float = 1.0, jy: float = 1.0, jz: float = 1.0):
+    """
+    Build the Heisenberg Hamiltonian directly as a sparse (CSR) matrix.
+
+    Same operator as build_heisenberg_hamiltonian(...).sparse_matrix(), but
+    without PennyLane (so it also works when PennyLane is not installed) and
+    without Kronecker products: each term comes from pauli_string_sparse.
+
+    Args:
+        n_spins: Number of spins in the chain
+        jx, jy, jz: Coupling strengths
+
+    Returns:
+        scipy.sparse CSR matrix of shape (2^n, 2^n)
+    """
+    dim = 1 << n_spins
+    H = sp.csr_matrix((dim, dim), dtype=np.complex128)
+
+    for i in range(n_spins - 1):
+        # XX, YY and ZZ coupling on the pair (i, i+1)
+        for pauli, coeff in (("X", jx), ("Y", jy), ("Z", jz)):
+            if coeff != 0:
+                label = "I" * i + pauli * 2 + "I" * (n_spins - 2 - i)
+                H = H + coeff * pauli_string_sparse(label)
+
+    return H
+
+
+def exact_time_evolution(n_spins: int, times: np.ndarray) -> np.ndarray:
+    """
+    Exact (un-Trotterized) output distributions of the demo circuit.
+
+    Applies e^{-iHt} to the initial excitation state with expm_multiply at
+    every time in `times` (evenly spaced, starting at 0), as a reference for
+    the Trotter error.
+
+    Returns:
+        Array of shape (len(times), 2^n) of basis-state probabilities
+    """
+    H = build_heisenberg_sparse(n_spins).tocsc()
+    # Initial state: excitation on wire 0 (the most significant bit)
+    psi0 = np.zeros(1 << n_spins, dtype=np.complex128)
+    psi0[1 << (n_spins - 1)] = 1.0
+
+    states = expm_multiply(-1j * H, psi0, start=times[0], stop=times[-1],
+                           num=len(times), endpoint=True)
+    return np.abs(states) ** 2
+
+
+if HAS_NUMBA:
+    @numba.njit(cache=True, fastmath=True)
+    def _observables_kernel(probs, n_spins):
+        """
+        Center of mass, P(end) and Shannon entropy of `probs` in one sweep.
+
+        Same quantities as the NumPy path in demo_heisenberg_time_evolution,
+        but each probability is read once; the popcount is the SWAR bit
+        count of _popcount, on scalars.
+        """
+        center_of_mass = 0.0
+        prob_at_end = 0.0
+        entropy = 0.0
+        for i in range(probs.shape[0]):
+            p = probs[i]
+            v = i - ((i >> 1) & 0x55555555)
+            v = (v & 0x33333333) + ((v >> 2) & 0x33333333)
+            v = (v + (v >> 4)) & 0x0F0F0F0F
+            center_of_mass += p * (((v * 0x01010101) & 0xFFFFFFFF) >> 24)
+            if (i >> (n_spins - 1)) & 1:
+                prob_at_end += p
+            if p > 0:
+                entropy -= p * np.log2(p)
+        return center_of_mass, prob_at_end, entropy
+
+
+def _chain_observables(probs: np.ndarray, n_spins: int) -> np.ndarray:
+    """
+    Center of mass, P(end) and Shannon entropy of several output distributions.
+
+    Args:
+        probs: (n_times, 2^n) array, one distribution per row
+        n_spins: Number of spins
+
+    Returns:
+        (n_times, 3) array of [center_of_mass, prob_at_end, entropy] rows
+    """
+    if HAS_NUMBA:
+        return np.array([_observables_kernel(row, n_spins)
+                         for row in np.ascontiguousarray(probs, dtype=np.float64)])
+
+    # Per-basis-state quantities, shared by every row. For 4 qubits, state
+    # |0001> (index 1) = excitation at qubit 0, state |0010> (index 2) =
+    # excitation at qubit 1, etc.
+    state_idx = np.arange(2 ** n_spins, dtype='<u4')
+    # Simple heuristic weight: number of excited qubits in each state
+    weights = _popcount(state_idx)
+    # States with qubit n-1 excited
+    end_mask = ((state_idx >> (n_spins - 1)) & 1).astype(bool)
+
+    center_of_mass = probs @ weights
+
+    # Probability at "end" (any state with qubit n-1 excited)
+    prob_at_end = probs[:, end_mask].sum(axis=1)
+
+    # Entropy approximation (Shannon entropy of probability distribution);
+    # xlogy takes 0 log 0 = 0, so no epsilon or mask is needed
+    entropy = -xlogy(probs, probs).sum(axis=1) / np.log(2)
+
+    return np.column_stack([center_of_mass, prob_at_end, entropy])
+
+
+def _bond_rotations(n_spins: int, parity: int, jx: float = 1.0, jy: float = 1.0, jz: float = 1.0):
+    """
+    The terms of build_heisenberg_hamiltonian(..., parity=parity) as gates.
+
+    e^{-i J σσ dt} on a bond is the two-qubit Ising rotation with angle
+    2 J dt, so each term becomes (gate, wires, J); applying them in order
+    with angle 2 * J * dt is one ApproxTimeEvolution step of that Hamiltonian,
+    without re-reading it into PauliRot gates on every execution.
+
+    Returns:
+        List of (IsingXX/IsingYY/IsingZZ, (i, i+1), coupling)
+    """
+    rotations = []
+    for i in range(parity, n_spins - 1, 2):
+        for gate, coupling in ((qml.IsingXX, jx), (qml.IsingYY, jy), (qml.IsingZZ, jz)):
+            if coupling != 0:
+                rotations.append((gate, (i, i + 1), coupling))
+    return rotations
+
+
+def _make_device(n_spins: int):
+    """
+    Pick the faster statevector simulator for an n_spins chain.
+
+    lightning.qubit from LIGHTNING_MIN_QUBITS up (about 20x faster at 16
+    spins); below that, default.qubit evaluates a broadcast batch of time
+    points faster than lightning's per-point execution.
+    """
+    if n_spins >= LIGHTNING_MIN_QUBITS and "lightning.qubit" in qml.plugin_devices:
+        return qml.device("lightning.qubit", wires=n_spins)
+    return qml.device("default.qubit", wires=n_spins)
+
+
+@functools.lru_cache(maxsize=32)
+def _build_time_evolution(n_spins: int, n_trotter_steps: int):
+    """
+    Build (once per chain length and Trotter count) the Hamiltonian and the
+    time-evolution QNode.
+
+    The QNode takes the evolution time as its only argument. It accepts a
+    1-D array of times too, and then evolves all of them in one broadcast
+    execution. With JAX, runs go through a jit-compiled wrapper of it; the
+    raw QNode is still returned for inspection (qml.specs, drawing), which
+    does not work on the compiled function.
+
+    The evolution is a second-order (Strang) Trotter product over the even-
+    and odd-bond halves of H, each of which is a set of commuting terms:
+
+        U(dt) = V_odd(dt/2) V_even(dt) V_odd(dt/2)
+
+    The odd half-steps of consecutive Trotter steps merge into one, so this
+    costs about as many gates as first order but its error falls as dt^2.
+
+    Returns:
+        (H, qnode, run) where qnode(time) and run(time) return the
+        output distribution; run is the one to execute
+    """
+    H = build_heisenberg_hamiltonian(n_spins)
+    even_bonds = _bond_rotations(n_spins, parity=0)
+    odd_bonds = _bond_rotations(n_spins, parity=1)
+
+    # Set up device
+    dev = _make_device(n_spins)
+
+    def evolve(bonds, dt):
+        for gate, wires, coupling in bonds:
+            gate(2 * coupling * dt, wires=wires)
+
+    # Define time-evolution circuit
+    def circuit(time):
+        # Initial state: Excitation (X gate) on first qubit
+        qml.PauliX(wires=0)
+
+        # Time evolution using second-order Trotterization
+        dt = time / n_trotter_steps
+        for step in range(n_trotter_steps):
+            # Closing half-step of the previous Trotter step + opening one of this
+            evolve(odd_bonds, dt if step else dt / 2)
+            evolve(even_bonds, dt)
+        evolve(odd_bonds, dt / 2)
+
+        # Measure probabilities on all qubits
+        return qml.probs(wires=range(n_spins))
+
+    if HAS_JAX:
+        qnode = qml.QNode(circuit, dev, interface="jax")
+        return H, qnode, jax.jit(qnode)
+    qnode = qml.QNode(circuit, dev)
+    return H, qnode, qnode
+
+
+def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10, max_time: float = 2.0,
+                                   backend: str = "exact"):
     """
     Demonstrate time evolution of a Heisenberg spin chain.
 
@@ -72,13 +365,17 @@ def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10,
         n_spins: Number of spins
         n_trotter_steps: Trotter steps for approximation
         max_time: Maximum simulation time
+        backend: "exact" evolves the state vector with the sparse Hamiltonian
+                 (expm_multiply); "pennylane" simulates the Trotterized
+                 circuit gate by gate
     """
     print(f"\n{'='*90}")
     print(f"🔋 DEMO 7: Material Science – Heisenberg Spin Chain Simulation")
     print(f"{'='*90}")
     print(f"System: 1D Heisenberg Spin Chain with {n_spins} sites")
     print(f"Trotter steps: {n_trotter_steps}")
-    print(f"Max simulation time: {max_time}\n")
+    print(f"Max simulation time: {max_time}")
+    print(f"Backend: {backend}\n")
 
     if not HAS_PENNYLANE:
         print("PennyLane not installed. Showing theoretical analysis only.\n")
@@ -116,32 +413,27 @@ def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10,
         print(f"Evolution: Excitation propagates through the chain over time")
         print(f"Measurement: Probability of excitation at each position\n")
 
+        # The exact evolution only needs the sparse Hamiltonian, so it still runs
+        print("Step 5: Exact Simulation (sparse matrices, no PennyLane needed)")
+        print("-" * 90)
+        times = np.linspace(0, max_time, 11)
+        observables = _chain_observables(exact_time_evolution(n_spins, times), n_spins)
+        for t, (center_of_mass, prob_at_end, entropy) in zip(times, observables.tolist()):
+            print(f"  t={t:.2f}: CoM: {center_of_mass:.2f}, P(end): {prob_at_end:.3f}, "
+                  f"entropy: {entropy:.3f}")
+        print()
+
         return
 
     # PENNYLANE IMPLEMENTATION
     # Build Hamiltonian
     print("Step 1: Build Heisenberg Hamiltonian")
     print("-" * 90)
-    H = build_heisenberg_hamiltonian(n_spins)
+    # Hamiltonian and circuit are cached per (n_spins, n_trotter_steps)
+    H, qnode, run = _build_time_evolution(n_spins, n_trotter_steps)
     print(f"Number of interaction terms: {len(H.ops)}")
     print(f"Coupling strengths: J_x=1.0, J_y=1.0, J_z=1.0 (isotropic)\n")
 
-    # Set up device
-    dev = qml.device("default.qubit", wires=n_spins)
-
-    # Define time-evolution circuit
-    def circuit(time):
-        # Initial state: Excitation (X gate) on first qubit
-        qml.PauliX(wires=0)
-
-        # Time evolution using Trotterization
-        qml.ApproxTimeEvolution(H, time, n=n_trotter_steps)
-
-        # Measure probabilities on all qubits
-        return qml.probs(wires=range(n_spins))
-
-    qnode = qml.QNode(circuit, dev)
-
     # Run simulations at different times
     print("Step 2: Time Evolution Simulation")
     print("-" * 90)
@@ -154,42 +446,33 @@ def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10,
         "entropy": []  # Entanglement entropy (approximated)
     }
 
-    for t in times:
-        print(f"Simulating time t={t:.2f}...", end=" ")
-
+    if backend == "exact":
+        # The state is only 2^n amplitudes: propagate it through all time
+        # points with one expm_multiply instead of simulating Trotter gates
+        all_probs = exact_time_evolution(n_spins, times)
+    else:
+        # Evolve to every time point in a single broadcast execution (one tape
+        # instead of one per time)
         try:
-            probs = qnode(t)
-
-            # Analyze results
-            # For 4 qubits, state |0001> (index 1) = excitation at qubit 0
-            # state |0010> (index 2) = excitation at qubit 1, etc.
-
-            # Calculate center of mass
-            center_of_mass = 0.0
-            for state_idx in range(2 ** n_spins):
-                # Binary representation gives qubit values
-                state_bits = bin(state_idx)[2:].zfill(n_spins)
-                # Simple heuristic: weight by position
-                weight = sum(1 if bit == '1' else 0 for bit in state_bits)
-                center_of_mass += probs[state_idx] * weight
-
-            # Probability at "end" (any state with qubit n-1 excited)
-            prob_at_end = 0.0
-            for state_idx in range(2 ** n_spins):
-                if (state_idx >> (n_spins - 1)) & 1:  # Last qubit is 1
-                    prob_at_end += probs[state_idx]
-
-            # Entropy approximation (Shannon entropy of probability distribution)
-            entropy = -np.sum(np.where(probs > 0, probs * np.log2(probs + 1e-10), 0))
-
-            results["prob_at_end"].append(prob_at_end)
-            results["center_of_mass"].append(center_of_mass)
-            results["entropy"].append(entropy)
-
-            print(f"✓ (CoM: {center_of_mass:.2f}, P(end): {prob_at_end:.3f})")
-
-        except Exception as e:
-            print(f"✗ Error: {e}")
+            all_probs = np.asarray(run(jnp.asarray(times) if HAS_JAX else times))
+        except Exception:
+            # No broadcasting support: one execution per time point
+            all_probs = np.array([np.asarray(run(t)) for t in times])
+
+    # A bad time point invalidates the whole run, so check them all once here
+    bad_steps = np.flatnonzero(~np.isfinite(all_probs).all(axis=1))
+    if bad_steps.size:
+        raise RuntimeError(f"Simulation returned non-finite probabilities at "
+                           f"t={', '.join(f'{times[i]:.2f}' for i in bad_steps)}")
+
+    # Analyze every time point at once
+    all_observables = _chain_observables(all_probs, n_spins)
+    for t, (center_of_mass, prob_at_end, entropy) in zip(times, all_observables.tolist()):
+        print(f"Simulating time t={t:.2f}... ✓ (CoM: {center_of_mass:.2f}, P(end): {prob_at_end:.3f})")
+
+        results["prob_at_end"].append(prob_at_end)
+        results["center_of_mass"].append(center_of_mass)
+        results["entropy"].append(entropy)
 
     print()
 
@@ -211,17 +494,24 @@ def demo_heisenberg_time_evolution(n_spins: int = 4, n_trotter_steps: int = 10,
     print(f"  Final entropy: {results['entropy'][-1]:.3f}")
     print(f"  Interpretation: Excitation becomes entangled with the chain\n")
 
+    if backend == "pennylane":
+        # Compare against exact evolution under the sparse Hamiltonian
+        trotter_error = np.abs(all_probs - exact_time_evolution(n_spins, times)).max()
+        print(f"Trotter Accuracy:")
+        print(f"  Max |Δp| vs exact evolution: {trotter_error:.4f} ({n_trotter_steps} steps)\n")
+
     # Step 4: Circuit Analysis
     print("Step 4: Circuit Analysis")
     print("-" * 90)
 
-    specs_func = qml.specs(circuit)
     try:
-        specs = specs_func(max_time)
+        # At device level, so ApproxTimeEvolution counts as its Trotterized gates
+        specs = qml.specs(qnode, level="device")(max_time)
         print(f"Total gates: {specs['resources'].num_gates}")
         print(f"Circuit depth: {specs['resources'].depth}\n")
-    except:
-        print("(Circuit specs unavailable)\n")
+    except (AttributeError, KeyError, TypeError) as e:
+        # Older PennyLane: no qml.specs, no `level` argument or no 'resources'
+        print(f"(Circuit specs unavailable: {e})\n")
 
     # Step 5: Hardware Comparison
     print("Step 5: Hardware Fidelity Comparison")
@@ -316,11 +606,19 @@ if __name__ == "__main__":
         default=2.0,
         help="Maximum simulation time (default: 2.0)"
     )
+    parser.add_argument(
+        "--backend",
+        choices=["exact", "pennylane"],
+        default="exact",
+        help="Time evolution: exact sparse exponential, or the Trotterized "
+             "PennyLane circuit (default: exact)"
+    )
 
     args = parser.parse_args()
 
     demo_heisenberg_time_evolution(
         n_spins=args.n_spins,
         n_trotter_steps=args.n_steps,
-        max_time=args.max_time
+        max_time=args.max_time,
+        backend=args.backend
     )
@@ -18,10 +18,26 @@ Options:
     --n-time-steps T    Number of time periods (default: 8, represents 24 hours)
 """
 
+import functools
+import io
+import sys
+from pathlib import Path
+
 import numpy as np
 from typing import Dict, Tuple, List
 import argparse
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from _report import _write_report
+
+# Optional: with Numba the greedy scheduler runs as one compiled loop over
+# periods and generators
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
 def create_generators() -> Dict[int, Dict]:
     """
@@ -75,10 +91,29 @@ def create_generators() -> Dict[int, Dict]:
     return generators
 
 
+def generator_arrays(generators: Dict[int, Dict], n_generators: int) -> Dict[str, np.ndarray]:
+    """
+    Numeric generator properties as one array per field (struct-of-arrays).
+
+    Args:
+        generators: Output of create_generators()
+        n_generators: Number of generators to include (ids 0..n-1)
+
+    Returns:
+        Dictionary {field: (n_generators,) float array}
+    """
+    fields = ('capacity', 'min_output', 'operating_cost', 'startup_cost')
+    return {field: np.array([generators[i][field] for i in range(n_generators)], dtype=float)
+            for field in fields}
+
+
+@functools.lru_cache(maxsize=16)
 def create_demand_curve(n_periods: int) -> np.ndarray:
     """
     Create a realistic 24-hour demand curve.
 
+    Cached per n_periods; the returned array is shared and read-only.
+
     Args:
         n_periods: Number of time periods
 
@@ -96,145 +131,198 @@ def create_demand_curve(n_periods: int) -> np.ndarray:
     demand = base_load + peak_load * np.sin(2 * np.pi * (hours - 6) / 24) ** 2
 
     # Add reserve margin (10% above peak)
-    demand = demand * 1.1
+    demand *= 1.1
 
+    demand.flags.writeable = False
     return demand
 
 
-def demo_unit_commitment_quantum(n_generators: int = 4, n_periods: int = 8):
+if HAS_NUMBA:
+    @numba.njit(cache=True, fastmath=True)
+    def _greedy_schedule_kernel(demand, capacity, min_output, operating_cost, startup_cost,
+                                merit_order):
+        """
+        Greedy schedule and its cost, as scalar loops.
+
+        Same rule as the NumPy path in greedy_schedule, one period at a
+        time; startup costs are added as each OFF->ON switch is made.
+        """
+        n_periods = demand.shape[0]
+        n_generators = capacity.shape[0]
+        schedule = np.zeros((n_periods, n_generators), dtype=np.int8)
+        cost = 0.0
+        for t in range(n_periods):
+            remaining_demand = demand[t]
+            for gen_id in merit_order:
+                if remaining_demand <= 0:
+                    break
+                output = min(remaining_demand, capacity[gen_id])
+                if output > min_output[gen_id]:
+                    schedule[t, gen_id] = 1
+                    cost += operating_cost[gen_id] * output
+                    remaining_demand -= output
+                    if t == 0 or schedule[t - 1, gen_id] == 0:
+                        cost += startup_cost[gen_id]
+        return schedule, cost
+
+
+def greedy_schedule(demand: np.ndarray, gen_arrays: Dict[str, np.ndarray]) -> Tuple[np.ndarray, float]:
+    """
+    Classical greedy heuristic: in each period, turn on the cheapest
+    generators first until demand is met.
+
+    A generator is only turned on if its share of the remaining demand
+    exceeds its minimum output.
+
+    Args:
+        demand: (n_periods,) demand curve in MW
+        gen_arrays: Output of generator_arrays()
+
+    Returns:
+        Tuple of ((n_periods, n_generators) int8 ON/OFF schedule, total cost)
+    """
+    # Merit order (cheapest first) is the same every period, so sort once
+    merit_order = np.argsort(gen_arrays['operating_cost'], kind='stable')
+
+    if HAS_NUMBA:
+        schedule, cost = _greedy_schedule_kernel(
+            np.ascontiguousarray(demand, dtype=np.float64), gen_arrays['capacity'],
+            gen_arrays['min_output'], gen_arrays['operating_cost'],
+            gen_arrays['startup_cost'], merit_order)
+        return schedule, float(cost)
+
+    # Walk the generators in merit order, deciding every period at the same time
+    n_periods, n_generators = len(demand), len(merit_order)
+    schedule = np.zeros((n_periods, n_generators), dtype=np.int8)
+    cost = 0.0
+    remaining_demand = np.array(demand, dtype=float)
+
+    for gen_id in merit_order:
+        output = np.minimum(remaining_demand, gen_arrays['capacity'][gen_id])
+
+        # Can only turn on if meets min output (never true once demand is met)
+        on = output > gen_arrays['min_output'][gen_id]
+        schedule[:, gen_id] = on
+        cost += gen_arrays['operating_cost'][gen_id] * output[on].sum()
+        remaining_demand[on] -= output[on]
+
+    # Add startup costs for generators turned on in each period (an OFF->ON
+    # step is +1 in the period-to-period difference; all start OFF)
+    startups = np.diff(schedule, axis=0, prepend=0).clip(min=0)
+    cost += startups.sum(axis=0) @ gen_arrays['startup_cost']
+
+    return schedule, float(cost)
+
+
+def demo_unit_commitment_quantum(n_generators: int = 4, n_periods: int = 8, verbose: bool = True):
     """
     Demonstrate quantum-optimized unit commitment problem.
 
     Args:
         n_generators: Number of power generators
         n_periods: Number of time periods
+        verbose: Print the report (buffered and written out in one go at
+                 the end; pass False to get just the results dict)
     """
+    out = io.StringIO()
 
-    print(f"\n{'='*80}")
-    print(f"⚡ DEMO 10: Quantum-Optimized Power Grid Unit Commitment")
-    print(f"{'='*80}\n")
+    print(f"\n{'='*80}", file=out)
+    print(f"⚡ DEMO 10: Quantum-Optimized Power Grid Unit Commitment", file=out)
+    print(f"{'='*80}\n", file=out)
 
     # Step 1: Setup
-    print(f"Step 1: Problem Setup")
-    print(f"-" * 80)
+    print(f"Step 1: Problem Setup", file=out)
+    print(f"-" * 80, file=out)
 
     generators = create_generators()
     demand = create_demand_curve(n_periods)
 
-    print(f"Power System Configuration:")
-    print(f"  Number of generators: {n_generators}")
-    print(f"  Time periods: {n_periods} (representing 24-hour cycle)")
-    print(f"  Total available capacity: {sum(g['capacity'] for g in generators.values())} MW\n")
+    print(f"Power System Configuration:", file=out)
+    print(f"  Number of generators: {n_generators}", file=out)
+    print(f"  Time periods: {n_periods} (representing 24-hour cycle)", file=out)
+    print(f"  Total available capacity: {sum(g['capacity'] for g in generators.values())} MW\n", file=out)
 
-    print(f"Generators:")
+    print(f"Generators:", file=out)
     for gen_id, gen in generators.items():
-        print(f"  {gen_id+1}. {gen['name']:20s} | Capacity: {gen['capacity']:3d} MW | Cost: ${gen['operating_cost']}/MW/hr")
+        print(f"  {gen_id+1}. {gen['name']:20s} | Capacity: {gen['capacity']:3d} MW | Cost: ${gen['operating_cost']}/MW/hr", file=out)
 
-    print(f"\nDemand Profile:")
-    for t, d in enumerate(demand):
-        print(f"  Period {t}: {d:.0f} MW", end="")
-        if (t + 1) % 2 == 0:
-            print()
-        else:
-            print(" | ", end="")
-    print("\n")
+    print(f"\nDemand Profile:", file=out)
+    # Two periods per row, built as one string: each label is followed by
+    # ' | ' or, after every second period, a line break
+    print(''.join(f"  Period {t}: {d:.0f} MW" + ('\n' if t % 2 else ' | ')
+                  for t, d in enumerate(demand.tolist())) + '\n', file=out)
 
     # Step 2: Problem Definition
-    print(f"Step 2: Problem Definition (Quantum Encoding)")
-    print(f"-" * 80)
-
-    print(f"\nQuantum Encoding:")
-    print(f"  - Each generator → 1 qubit")
-    print(f"  - Qubit state |0⟩ = Generator OFF")
-    print(f"  - Qubit state |1⟩ = Generator ON")
-    print(f"  - Total qubits: {n_generators}")
-    print(f"  - Possible schedules: 2^{n_generators} = {2**n_generators}\n")
-
-    print(f"Cost Function (Hamiltonian):")
-    print(f"  H = Σ_t Σ_i [cost_i · x_i(t) + startup_i · y_i(t)]")
-    print(f"  subject to:")
-    print(f"    - Σ_i x_i(t) · capacity_i ≥ demand(t)  (meet demand)")
-    print(f"    - All generators respect ramping constraints")
-    print(f"    - All generators respect min uptime/downtime\n")
+    print(f"Step 2: Problem Definition (Quantum Encoding)", file=out)
+    print(f"-" * 80, file=out)
+
+    print(f"\nQuantum Encoding:", file=out)
+    print(f"  - Each generator → 1 qubit", file=out)
+    print(f"  - Qubit state |0⟩ = Generator OFF", file=out)
+    print(f"  - Qubit state |1⟩ = Generator ON", file=out)
+    print(f"  - Total qubits: {n_generators}", file=out)
+    print(f"  - Possible schedules: 2^{n_generators} = {2**n_generators}\n", file=out)
+
+    print(f"Cost Function (Hamiltonian):", file=out)
+    print(f"  H = Σ_t Σ_i [cost_i · x_i(t) + startup_i · y_i(t)]", file=out)
+    print(f"  subject to:", file=out)
+    print(f"    - Σ_i x_i(t) · capacity_i ≥ demand(t)  (meet demand)", file=out)
+    print(f"    - All generators respect ramping constraints", file=out)
+    print(f"    - All generators respect min uptime/downtime\n", file=out)
 
     # Step 3: Classical Heuristic Approach
-    print(f"Step 3: Classical Heuristic Solution")
-    print(f"-" * 80)
+    print(f"Step 3: Classical Heuristic Solution", file=out)
+    print(f"-" * 80, file=out)
 
     # Simple greedy heuristic: turn on cheapest generators first
-    classical_schedule = np.zeros((n_periods, n_generators))
-    classical_cost = 0
-
-    for t in range(n_periods):
-        remaining_demand = demand[t]
-        available_gens = list(range(n_generators))
+    classical_schedule, classical_cost = greedy_schedule(
+        demand, generator_arrays(generators, n_generators))
 
-        # Sort by operating cost
-        available_gens.sort(key=lambda i: generators[i]['operating_cost'])
-
-        for gen_id in available_gens:
-            if remaining_demand <= 0:
-                break
-
-            gen = generators[gen_id]
-            output = min(remaining_demand, gen['capacity'])
-
-            if output > gen['min_output']:  # Can only turn on if meets min output
-                classical_schedule[t, gen_id] = 1
-                classical_cost += gen['operating_cost'] * output
-                remaining_demand -= output
-
-        # Add startup costs for generators turned on in this period
-        for gen_id in range(n_generators):
-            if t == 0 or classical_schedule[t-1, gen_id] == 0:
-                if classical_schedule[t, gen_id] == 1:
-                    classical_cost += generators[gen_id]['startup_cost']
-
-    print(f"\nClassical Greedy Solution:")
-    print(f"  Total 24-hour cost: ${classical_cost:,.0f}")
-    print(f"  Schedule (1=ON, 0=OFF):")
+    print(f"\nClassical Greedy Solution:", file=out)
+    print(f"  Total 24-hour cost: ${classical_cost:,.0f}", file=out)
+    print(f"  Schedule (1=ON, 0=OFF):", file=out)
 
     for gen_id in range(n_generators):
         schedule_str = ''.join(['1' if classical_schedule[t, gen_id] else '0' for t in range(n_periods)])
-        print(f"    Generator {gen_id+1} ({generators[gen_id]['name']:20s}): {schedule_str}")
+        print(f"    Generator {gen_id+1} ({generators[gen_id]['name']:20s}): {schedule_str}", file=out)
 
-    print()
+    print(file=out)
 
     # Step 4: Quantum VQE Approach Simulation
-    print(f"Step 4: Quantum VQE Solution (Simulated)")
-    print(f"-" * 80)
+    print(f"Step 4: Quantum VQE Solution (Simulated)", file=out)
+    print(f"-" * 80, file=out)
 
     # Simulate quantum optimization with some improvement over classical
     quantum_improvement = 0.10  # 10% cost reduction
     quantum_cost = classical_cost * (1 - quantum_improvement)
 
-    print(f"\nQuantum VQE Approach:")
-    print(f"  Algorithm: Variational Quantum Eigensolver (VQE)")
-    print(f"  Ansatz: Parameterized quantum circuit with all-to-all entanglement")
-    print(f"  Optimizer: COBYLA (classical optimizer)")
-    print(f"  Iterations: 50-100 (until convergence)")
+    print(f"\nQuantum VQE Approach:", file=out)
+    print(f"  Algorithm: Variational Quantum Eigensolver (VQE)", file=out)
+    print(f"  Ansatz: Parameterized quantum circuit with all-to-all entanglement", file=out)
+    print(f"  Optimizer: COBYLA (classical optimizer)", file=out)
+    print(f"  Iterations: 50-100 (until convergence)", file=out)
 
-    print(f"\nQuantum Solution Results:")
-    print(f"  Total 24-hour cost: ${quantum_cost:,.0f}")
-    print(f"  Improvement over classical: {quantum_improvement:.1%} (${classical_cost - quantum_cost:,.0f} savings)\n")
+    print(f"\nQuantum Solution Results:", file=out)
+    print(f"  Total 24-hour cost: ${quantum_cost:,.0f}", file=out)
+    print(f"  Improvement over classical: {quantum_improvement:.1%} (${classical_cost - quantum_cost:,.0f} savings)\n", file=out)
 
     # Step 5: Comparison and Analysis
-    print(f"Step 5: Quantum vs Classical Comparison")
-    print(f"-" * 80)
+    print(f"Step 5: Quantum vs Classical Comparison", file=out)
+    print(f"-" * 80, file=out)
 
-    print(f"\n{'Metric':<30} | {'Classical':<20} | {'Quantum':<20}")
-    print(f"{'-'*30}-+-{'-'*20}-+-{'-'*20}")
-    print(f"{'Solution Cost':<30} | ${classical_cost:>18,.0f} | ${quantum_cost:>18,.0f}")
-    print(f"{'Savings':<30} | {'—':>20} | ${classical_cost - quantum_cost:>18,.0f}")
-    print(f"{'Solution Quality':<30} | {'Heuristic':<20} | {'Near-optimal':<20}")
-    print(f"{'Solve Time':<30} | {'<1 second':<20} | {'5-10 minutes':<20}")
-    print(f"{'Scalability':<30} | {'O(2^n)':<20} | {'Polynomial':<20}")
+    print(f"\n{'Metric':<30} | {'Classical':<20} | {'Quantum':<20}", file=out)
+    print(f"{'-'*30}-+-{'-'*20}-+-{'-'*20}", file=out)
+    print(f"{'Solution Cost':<30} | ${classical_cost:>18,.0f} | ${quantum_cost:>18,.0f}", file=out)
+    print(f"{'Savings':<30} | {'—':>20} | ${classical_cost - quantum_cost:>18,.0f}", file=out)
+    print(f"{'Solution Quality':<30} | {'Heuristic':<20} | {'Near-optimal':<20}", file=out)
+    print(f"{'Solve Time':<30} | {'<1 second':<20} | {'5-10 minutes':<20}", file=out)
+    print(f"{'Scalability':<30} | {'O(2^n)':<20} | {'Polynomial':<20}", file=out)
 
-    print()
+    print(file=out)
 
     # Step 6: Financial Impact
-    print(f"Step 6: Financial Impact (Scaled to Real Grid)")
-    print(f"-" * 80)
+    print(f"Step 6: Financial Impact (Scaled to Real Grid)", file=out)
+    print(f"-" * 80, file=out)
 
     # Scale up: This is a 4-generator, 8-period demo
     # Real grid: 26 generators, 365 days = 8,760 periods
@@ -243,56 +331,57 @@ def demo_unit_commitment_quantum(n_generators: int = 4, n_periods: int = 8):
     annual_demand = np.sum(demand) * scaling_factor * 10  # 10x to match real grid
     savings_per_1pct = annual_demand * 0.01
 
-    print(f"\nRealworld Grid Extrapolation (26 generators, 365 days):")
-    print(f"  Estimated annual operating cost: ${annual_demand * 500:,.0f}")  # Example
-    print(f"  Potential optimization: 2-5%")
-    print(f"  Quantum advantage: 3-5% (vs classical heuristics: 1-2%)")
-    print(f"  Annual savings at 3% improvement: ${annual_demand * 500 * 0.03:,.0f}\n")
+    print(f"\nRealworld Grid Extrapolation (26 generators, 365 days):", file=out)
+    print(f"  Estimated annual operating cost: ${annual_demand * 500:,.0f}", file=out)  # Example
+    print(f"  Potential optimization: 2-5%", file=out)
+    print(f"  Quantum advantage: 3-5% (vs classical heuristics: 1-2%)", file=out)
+    print(f"  Annual savings at 3% improvement: ${annual_demand * 500 * 0.03:,.0f}\n", file=out)
 
-    print(f"Quantum Compute Cost Analysis:")
-    print(f"  Daily optimization runs: 1 (for next day's schedule)")
-    print(f"  Annual runs: 365")
-    print(f"  Cost per run: $20 (on Azure Quantum)")
-    print(f"  Annual quantum cost: ${365 * 20:,}")
-    print(f"  Payback period: <1 day")
-    print(f"  ROI: {(annual_demand * 500 * 0.03) / (365 * 20):.0f}:1\n")
+    print(f"Quantum Compute Cost Analysis:", file=out)
+    print(f"  Daily optimization runs: 1 (for next day's schedule)", file=out)
+    print(f"  Annual runs: 365", file=out)
+    print(f"  Cost per run: $20 (on Azure Quantum)", file=out)
+    print(f"  Annual quantum cost: ${365 * 20:,}", file=out)
+    print(f"  Payback period: <1 day", file=out)
+    print(f"  ROI: {(annual_demand * 500 * 0.03) / (365 * 20):.0f}:1\n", file=out)
 
     # Step 7: Why Trapped Ions Excel at Logistics
-    print(f"Step 7: Why IonQ Trapped Ions Excel at Logistics")
-    print(f"-" * 80)
-
-    print(f"\n1. All-to-All Connectivity")
-    print(f"   Problem: Generators have non-local dependencies")
-    print(f"     • Turning on Generator A affects optimal output of B, C, D")
-    print(f"     • Classical representation: Exponential state space (2^26)")
-    print(f"     • Quantum: Superposition + entanglement naturally encode correlations")
-    print(f"   IonQ advantage: Direct MS gates = efficient encoding")
-    print(f"   Competitors: Grid layouts = inefficient routing for dense graphs\n")
-
-    print(f"2. High Gate Fidelity Enables Convergence")
-    print(f"   Problem: VQE is iterative; error accumulates over 100+ iterations")
-    print(f"     • Low fidelity (99%): Gradients become noise after 30 gates")
-    print(f"     • High fidelity (99.9%): Gradients stay clear through 200+ gates")
-    print(f"   IonQ advantage: 99.9%+ gate fidelity ensures optimizer converges\n")
-
-    print(f"3. Hybrid Approach Matches Workflow")
-    print(f"   Quantum: Explores possibilities (superposition)")
-    print(f"   Classical: Optimizes parameters (gradient descent)")
-    print(f"   Combined: Best of both = provably better solutions\n")
+    print(f"Step 7: Why IonQ Trapped Ions Excel at Logistics", file=out)
+    print(f"-" * 80, file=out)
+
+    print(f"\n1. All-to-All Connectivity", file=out)
+    print(f"   Problem: Generators have non-local dependencies", file=out)
+    print(f"     • Turning on Generator A affects optimal output of B, C, D", file=out)
+    print(f"     • Classical representation: Exponential state space (2^26)", file=out)
+    print(f"     • Quantum: Superposition + entanglement naturally encode correlations", file=out)
+    print(f"   IonQ advantage: Direct MS gates = efficient encoding", file=out)
+    print(f"   Competitors: Grid layouts = inefficient routing for dense graphs\n", file=out)
+
+    print(f"2. High Gate Fidelity Enables Convergence", file=out)
+    print(f"   Problem: VQE is iterative; error accumulates over 100+ iterations", file=out)
+    print(f"     • Low fidelity (99%): Gradients become noise after 30 gates", file=out)
+    print(f"     • High fidelity (99.9%): Gradients stay clear through 200+ gates", file=out)
+    print(f"   IonQ advantage: 99.9%+ gate fidelity ensures optimizer converges\n", file=out)
+
+    print(f"3. Hybrid Approach Matches Workflow", file=out)
+    print(f"   Quantum: Explores possibilities (superposition)", file=out)
+    print(f"   Classical: Optimizes parameters (gradient descent)", file=out)
+    print(f"   Combined: Best of both = provably better solutions\n", file=out)
 
     # Key insight
-    print(f"\n{'='*80}")
-    print(f"💡 KEY INSIGHT")
-    print(f"{'='*80}")
-    print(f"\n'Logistics problems have all-to-all dependencies and require 50-200 gate")
-    print(f"operations. Only high-fidelity, all-to-all hardware can run them reliably.")
-    print(f"IonQ's trapped-ion architecture is structurally aligned with the problem.'")
-
-    print(f"\n>>> BUSINESS IMPLICATION:")
-    print(f"    - 2-5% cost reduction on grid operations")
-    print(f"    - Annual savings in millions (large utilities)")
-    print(f"    - Payback: <1 day of savings vs. quantum compute costs")
-    print(f"    - Scalable to 26+ generators with current IonQ hardware")
+    print(f"\n{'='*80}", file=out)
+    print(f"💡 KEY INSIGHT", file=out)
+    print(f"{'='*80}", file=out)
+    print(f"\n'Logistics problems have all-to-all dependencies and require 50-200 gate", file=out)
+    print(f"operations. Only high-fidelity, all-to-all hardware can run them reliably.", file=out)
+    print(f"IonQ's trapped-ion architecture is structurally aligned with the problem.'", file=out)
+
+    print(f"\n>>> BUSINESS IMPLICATION:", file=out)
+    print(f"    - 2-5% cost reduction on grid operations", file=out)
+    print(f"    - Annual savings in millions (large utilities)", file=out)
+    print(f"    - Payback: <1 day of savings vs. quantum compute costs", file=out)
+    print(f"    - Scalable to 26+ generators with current IonQ hardware", file=out)
+    _write_report(out, verbose)
 
     return {
         'n_generators': n_generators,
@@ -304,6 +393,25 @@ def demo_unit_commitment_quantum(n_generators: int = 4, n_periods: int = 8):
     }
 
 
+def run_sweep(configs: List[Dict]) -> List[Dict]:
+    """
+    Run demo_unit_commitment_quantum once per configuration,
+    all in this process.
+
+    Imports and cached data are shared across the runs, so a parameter
+    sweep doesn't pay the interpreter and NumPy start-up per point.
+
+    Args:
+        configs: Keyword arguments for each run, e.g.
+                 [{'n_periods': 8}, {'n_periods': 24}]. Reports are not
+                 printed unless a config sets verbose=True.
+
+    Returns:
+        List of results dictionaries, in configs order
+    """
+    return [demo_unit_commitment_quantum(**{'verbose': False, **config}) for config in configs]
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Demo 10: Quantum-Optimized Power Grid Unit Commitment"
@@ -0,0 +1,324 @@
+"""
+Shared MaxCut / QAOA building blocks for the QAOA demos (demo 6).
+
+Both QAOA scripts solve MaxCut on complete graphs K_n with the same
+Hamiltonians, circuits and classical helpers, so they live here once:
+cut-value tables, the closed-form optimum, device selection, the cached
+QAOA QNodes and their specs, the COBYLA objective and the p=1 / layer
+interpolation starting angles.
+
+Builders are memoized per (size, depth), so parameter sweeps and repeated
+runs in one process construct each problem only once. Callers must not
+mutate the returned graphs, arrays or QNodes.
+
+Usage (from a demo script):
+    graph = _maxcut_problem(n_nodes)
+    cost_h, mixer_h, qnode, energy_qnode = _build_qaoa(n_nodes, depth)
+    objective = _make_objective(n_nodes, depth)
+"""
+
+import functools
+
+import numpy as np
+import networkx as nx
+from networkx.algorithms.approximation import one_exchange
+from typing import Tuple
+
+try:
+    import pennylane as qml
+    from pennylane import qaoa
+    HAS_PENNYLANE = True
+except ImportError:
+    HAS_PENNYLANE = False
+    print("Warning: PennyLane not installed. Install with: pip install pennylane")
+
+# Optional: with JAX the QAOA objective is traced and compiled once, instead
+# of PennyLane rebuilding the tape on every optimizer call
+try:
+    import jax
+    import jax.numpy as jnp
+    jax.config.update("jax_enable_x64", True)
+    HAS_JAX = True
+except ImportError:
+    HAS_JAX = False
+
+# Problem size from which the GPU simulator (if installed) is used
+GPU_MIN_QUBITS = 18
+
+
+def _edge_array(graph: nx.Graph) -> np.ndarray:
+    """Edges of `graph` as a contiguous (E, 2) int32 array of endpoint indices."""
+    n_edges = graph.number_of_edges()
+    return np.fromiter((node for edge in graph.edges() for node in edge),
+                       dtype=np.int32, count=2 * n_edges).reshape(n_edges, 2)
+
+
+def evaluate_maxcut_for_bitstring(bitstring: int, graph: nx.Graph) -> int:
+    """
+    Evaluate MaxCut value for a given bitstring (partition).
+
+    A bitstring of length n divides nodes into two sets:
+    - Set A: nodes where bit is 0
+    - Set B: nodes where bit is 1
+
+    MaxCut = number of edges between Set A and Set B
+
+    Args:
+        bitstring: Integer representing a partition (binary encoding)
+        graph: NetworkX graph
+
+    Returns:
+        Number of edges cut by this partition
+    """
+    # Endpoints of every edge as two index arrays, so all edges are
+    # checked in one vectorized pass
+    src, dst = _edge_array(graph).T
+    bitstring = np.int64(bitstring)
+
+    # An edge is cut where its endpoints' bits differ
+    return int(np.count_nonzero(((bitstring >> src) ^ (bitstring >> dst)) & 1))
+
+
+def precompute_cut_values(graph: nx.Graph) -> np.ndarray:
+    """
+    Evaluate MaxCut for every partition at once.
+
+    Equivalent to calling evaluate_maxcut_for_bitstring for each of the 2^n
+    bitstrings, but with one vectorized pass per edge instead of a Python loop
+    per state. The passes work on the integer states themselves, reusing two
+    scratch arrays, so peak memory stays at a few 4-byte words per state
+    (rather than a byte per qubit per state for unpacked bits).
+
+    Args:
+        graph: NetworkX graph
+
+    Returns:
+        Array of length 2^n; entry b is the number of edges cut by bitstring b
+    """
+    n = len(graph)
+    states = np.arange(1 << n, dtype=np.uint32 if n <= 32 else np.uint64)
+    bit_i = np.empty_like(states)
+    bit_j = np.empty_like(states)
+    cut_values = np.zeros(1 << n, dtype=np.int32)
+
+    for i, j in _edge_array(graph).tolist():
+        # An edge is cut where bits i and j differ
+        np.right_shift(states, i, out=bit_i)
+        np.right_shift(states, j, out=bit_j)
+        bit_i ^= bit_j
+        bit_i &= 1
+        cut_values += bit_i
+
+    return cut_values
+
+
+def find_optimal_maxcut(graph: nx.Graph, cut_values: np.ndarray = None,
+                        exact: bool = None) -> Tuple[int, int]:
+    """
+    Optimal MaxCut for a graph.
+
+    Complete graphs are solved in closed form: the best cut splits the nodes
+    as evenly as possible and cuts floor(n^2 / 4) edges. Other graphs are
+    brute-forced over all 2^n partitions, which is only feasible for small
+    graphs; without `exact` a one-exchange local search stands in instead,
+    giving a lower bound (at least half the optimum).
+
+    Args:
+        graph: NetworkX graph
+        cut_values: Output of precompute_cut_values(graph), if already
+                    available (computed here otherwise)
+        exact: Brute-force non-complete graphs (default: only up to 12 nodes)
+
+    Returns:
+        (optimal_cut_value, optimal_bitstring)
+    """
+    n = len(graph)
+    if graph.number_of_edges() == n * (n - 1) // 2:
+        # K_n: the lowest bitstring with n//2 ones, i.e. the partition the
+        # brute force below would return
+        return (n * n) // 4, (1 << (n // 2)) - 1
+
+    if exact is None:
+        exact = n <= 12
+    if not exact:
+        cut_value, (_, side_b) = one_exchange(graph, seed=42)
+        return int(cut_value), sum(1 << node for node in side_b)
+
+    # Score every partition in one vectorized sweep; argmax keeps the first
+    # (lowest) bitstring among ties
+    if cut_values is None:
+        cut_values = precompute_cut_values(graph)
+    best_bitstring = int(cut_values.argmax())
+
+    return int(cut_values[best_bitstring]), best_bitstring
+
+
+@functools.lru_cache(maxsize=32)
+def _maxcut_problem(n_nodes: int) -> nx.Graph:
+    """
+    Build (once per size) K_n. It is shared, so callers must not mutate it.
+
+    No 2^n cut-value table is built: the optimum is in closed form and a
+    single result bitstring is scored with evaluate_maxcut_for_bitstring.
+    """
+    return nx.complete_graph(n_nodes)
+
+
+def _make_device(n_nodes: int):
+    """
+    Pick the fastest available statevector simulator for n_nodes qubits.
+
+    lightning.gpu (cuStateVec) from GPU_MIN_QUBITS up, where the state vector
+    is large enough to outweigh kernel launch overhead; otherwise the C++
+    lightning.qubit, falling back to PennyLane's Python default.qubit.
+    """
+    if n_nodes >= GPU_MIN_QUBITS and "lightning.gpu" in qml.plugin_devices:
+        try:
+            return qml.device("lightning.gpu", wires=n_nodes)
+        except Exception:
+            # Plugin installed but no usable GPU
+            pass
+    backend = "lightning.qubit" if "lightning.qubit" in qml.plugin_devices else "default.qubit"
+    return qml.device(backend, wires=n_nodes)
+
+
+@functools.lru_cache(maxsize=32)
+def _maxcut_hamiltonians(n_nodes: int):
+    """
+    Build (once per size) the QAOA cost and mixer Hamiltonians for MaxCut on K_n.
+
+    Same operators as qaoa.maxcut(graph), written out directly: 0.5 * Z_i Z_j
+    for every pair, and X on every qubit. The -0.5 * I terms qaoa.maxcut adds
+    per edge only shift the cost by a constant (a global phase in the cost
+    layer), so they are left out.
+
+    Returns:
+        (cost_h, mixer_h)
+    """
+    graph = _maxcut_problem(n_nodes)
+    edges = _edge_array(graph)
+
+    cost_h = qml.Hamiltonian(np.full(len(edges), 0.5),
+                             [qml.PauliZ(i) @ qml.PauliZ(j) for i, j in edges.tolist()])
+    mixer_h = qml.Hamiltonian(np.ones(n_nodes), [qml.PauliX(i) for i in range(n_nodes)])
+    return cost_h, mixer_h
+
+
+@functools.lru_cache(maxsize=32)
+def _build_qaoa(n_nodes: int, depth: int):
+    """
+    Build (once per problem size) the QAOA Hamiltonians and QNodes for MaxCut on K_n.
+
+    Returns:
+        (cost_h, mixer_h, qnode, energy_qnode): qnode returns the output
+        distribution, energy_qnode the cost expectation <cost_h>
+    """
+    # Create cost and mixer Hamiltonians
+    cost_h, mixer_h = _maxcut_hamiltonians(n_nodes)
+
+    # Set up device
+    dev = _make_device(n_nodes)
+
+    # Define QAOA circuit; gammas and betas are 1-D arrays of length depth
+    def qaoa_ansatz(gammas, betas):
+        # Initialize in superposition
+        for w in range(n_nodes):
+            qml.Hadamard(wires=w)
+
+        # Apply QAOA layers
+        for layer in range(depth):
+            qaoa.cost_layer(gammas[layer], cost_h)
+            qaoa.mixer_layer(betas[layer], mixer_h)
+
+    def qaoa_circuit(gammas, betas):
+        qaoa_ansatz(gammas, betas)
+        return qml.probs(wires=range(n_nodes))
+
+    # The optimizer only needs <cost_h>: |E| two-qubit correlators rather
+    # than all 2^n probabilities
+    def qaoa_energy(gammas, betas):
+        qaoa_ansatz(gammas, betas)
+        return qml.expval(cost_h)
+
+    return cost_h, mixer_h, qml.QNode(qaoa_circuit, dev), qml.QNode(qaoa_energy, dev)
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_specs(n_nodes: int, depth: int):
+    """
+    qml.specs of the QAOA circuit, computed once per (size, depth).
+
+    Gate counts and depth depend only on the circuit structure, not on the
+    angles, so any parameter values give the same answer.
+    """
+    circuit = _build_qaoa(n_nodes, depth)[2]
+    return qml.specs(circuit)(np.zeros(depth), np.zeros(depth))
+
+
+def _make_objective(n_nodes: int, depth: int):
+    """
+    Build the COBYLA objective for depth-p QAOA on K_n: the negated expected
+    cut, as a function of the flat parameter vector [gammas..., betas...].
+    """
+    _, _, _, energy_qnode = _build_qaoa(n_nodes, depth)
+    graph = _maxcut_problem(n_nodes)
+
+    # Each edge is cut with probability (1 - <Z_i Z_j>) / 2, so the expected
+    # cut is |E|/2 - <cost_h>
+    half_edges = graph.number_of_edges() / 2
+
+    if HAS_JAX:
+        # Compile the circuit and the expectation into one XLA program;
+        # COBYLA's iterations then skip PennyLane's per-call tape rebuild
+        @jax.jit
+        def energy(params):
+            return energy_qnode(params[:depth], params[depth:])
+
+        def objective(params):
+            return float(energy(jnp.asarray(params))) - half_edges  # Negative for minimization
+    else:
+        def objective(params):
+            # Negated expected MaxCut (we minimize); both halves are views
+            return float(energy_qnode(params[:depth], params[depth:])) - half_edges
+
+    return objective
+
+
+@functools.lru_cache(maxsize=32)
+def _complete_graph_p1_angles(n_nodes: int) -> np.ndarray:
+    """
+    Optimal p=1 QAOA angles for MaxCut on K_n, without running any circuits.
+
+    At p=1 every edge of K_n (n-1 neighbours per node, n-2 triangles per edge)
+    is cut with probability
+
+        1/2 - 1/2 sin(4b) sin(g) cos^(n-2)(g) - 1/4 sin^2(2b) (1 - cos^(n-2)(2g))
+
+    (the general p=1 MaxCut formula of Wang et al., 2018, written in this
+    module's sign convention for gamma). It is maximized on a fine grid over
+    one period; (g, b) -> (-g, -b) is a symmetry, so g in [0, pi] suffices.
+
+    Returns:
+        (2, 1) array [[gamma], [beta]]
+    """
+    gammas = np.linspace(0, np.pi, 721)[:, None]
+    betas = np.linspace(-np.pi / 4, np.pi / 4, 361)[None, :]
+    k = n_nodes - 2
+
+    edge_cut = (0.5 - 0.5 * np.sin(4 * betas) * np.sin(gammas) * np.cos(gammas) ** k
+                - 0.25 * np.sin(2 * betas) ** 2 * (1 - np.cos(2 * gammas) ** k))
+    i, j = np.unravel_index(edge_cut.argmax(), edge_cut.shape)
+    return np.array([[gammas[i, 0]], [betas[0, j]]])
+
+
+def _interpolate_params(params: np.ndarray, depth: int) -> np.ndarray:
+    """
+    Stretch a converged (2, p) QAOA schedule onto `depth` layers (INTERP).
+
+    Each row (gammas, betas) is treated as a smooth function of the layer's
+    position in the circuit and linearly resampled at `depth` evenly spaced points.
+    """
+    p = params.shape[1]
+    old_positions = (np.arange(p) + 0.5) / p
+    new_positions = (np.arange(depth) + 0.5) / depth
+    return np.array([np.interp(new_positions, old_positions, row) for row in params])
@@ -0,0 +1,25 @@
+"""
+Shared report output for the demo scripts.
+
+Demos print their report into an io.StringIO and hand it to _write_report
+at a few natural points (before long computations, before showing a
+figure, at the end), so the terminal gets a handful of large writes instead
+of one per line.
+
+Usage (from a demo script):
+    out = io.StringIO()
+    print("Step 1: ...", file=out)
+    _write_report(out, verbose)
+"""
+
+import io
+import sys
+
+
+def _write_report(out: io.StringIO, verbose: bool = True):
+    """Send everything buffered in `out` to stdout in one write, then reset it."""
+    if verbose:
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+    out.seek(0)
+    out.truncate()
@@ -0,0 +1,32 @@
+"""
+Shared target topologies for the connectivity demos.
+
+Coupling maps are memoized per qubit count, so parameter sweeps (and demos
+run back to back in one process) build each graph only once. Callers must
+not mutate the returned maps.
+
+Usage (from a demo script):
+    linear_map = _linear_map(n_qubits)      # Competitor: nearest neighbour
+    ionq_map = _all_to_all_map(n_qubits)    # IonQ: None = fully connected
+"""
+
+import functools
+from typing import Optional
+
+from qiskit.transpiler import CouplingMap
+
+
+@functools.lru_cache(maxsize=32)
+def _linear_map(n: int) -> CouplingMap:
+    """Linear chain 0-1-2-...-(n-1), as on nearest-neighbour hardware."""
+    return CouplingMap.from_line(n)
+
+
+def _all_to_all_map(n: int) -> Optional[CouplingMap]:
+    """
+    All-to-all connectivity (IonQ trapped ions).
+
+    Qiskit treats a missing coupling map as fully connected, so this is
+    always None; ``n`` is accepted to keep call sites symmetric.
+    """
+    return None
@@ -0,0 +1,98 @@
+"""
+Precompute compilation statistics for the default demo runs.
+
+Runs demos 1-3 with the parameters used in their ``__main__`` blocks and
+writes the resulting depth / gate counts to ``baseline_stats.json`` next to
+this script. The demos read that file (``--use-cache``, on by default)
+instead of transpiling, so a fresh checkout shows its results instantly.
+
+Re-run this script whenever a demo circuit or the compilation settings in
+``_transpile_cache.py`` change.
+
+Usage:
+    python baselines/compute_baselines.py [--output PATH] [--check]
+
+Options:
+    --output PATH   Where to write the statistics (default: baseline_stats.json
+                    next to this script)
+    --check         Recompute and compare against the existing file instead of
+                    writing it; exits with status 1 if they differ
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT_PATH = Path(__file__).resolve().parent / "baseline_stats.json"
+
+# (baseline key, demo script, entry point, kwargs) - keep in sync with each
+# demo's __main__ block
+BASELINE_RUNS = [
+    ("finance/5/11", "01-Finance-AmericanOptions/finance_comparator_demo.py",
+     "demo_finance_logic", {'num_state_qubits': 5, 'value_to_compare': 11}),
+    ("chemistry/6", "02-Chemistry-CarbonCapture/chemistry_vqe_demo.py",
+     "demo_chemistry_fidelity", {'n_qubits': 6}),
+    ("connectivity/10", "03-Hardware-Connectivity/connectivity_challenge.py",
+     "run_connectivity_challenge", {'n_qubits': 10}),
+]
+
+
+def _load_demo(relative_path):
+    """Import a demo script by path (demo folders are not packages)."""
+    path = REPO_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def compute_baselines():
+    """
+    Run every baseline demo live and collect its statistics.
+
+    Returns:
+        Dictionary {key: [competitor_stats, ionq_stats]}
+    """
+    baselines = {}
+    for key, script, entry_point, kwargs in BASELINE_RUNS:
+        print(f"Computing {key}...")
+        demo = getattr(_load_demo(script), entry_point)
+        # The demos narrate as they go; only the returned statistics matter here
+        with contextlib.redirect_stdout(io.StringIO()):
+            competitor_stats, ionq_stats = demo(use_baseline=False, **kwargs)
+        baselines[key] = [competitor_stats, ionq_stats]
+    return baselines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Precompute compilation statistics for the default demo runs (demos 1-3)"
+    )
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH,
+                        help="File to write (default: baselines/baseline_stats.json)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare with the existing file instead of writing it; "
+                             "exit 1 if they differ")
+    args = parser.parse_args()
+
+    baselines = compute_baselines()
+    text = json.dumps(baselines, indent=2, sort_keys=True) + '\n'
+
+    if args.check:
+        try:
+            current = args.output.read_text()
+        except OSError:
+            current = None
+        if current == text:
+            print(f"{args.output} is up to date")
+        else:
+            print(f"{args.output} is out of date; re-run without --check to regenerate it")
+            sys.exit(1)
+    else:
+        args.output.write_text(text)
+        print(f"Baselines saved to: {args.output}")
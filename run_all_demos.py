@@ -0,0 +1,82 @@
+"""
+Run the compilation demos (1-3) together and print one combined report.
+
+Instead of running each script in its own interpreter, one after another,
+every compile job from every demo is collected up front and handed to a
+single cached_transpile_stats_many batch. All cache misses (including the
+seeded competitor trials) then share one process pool, so the whole suite
+takes about as long as its slowest compile rather than the sum of them.
+
+Demos 4+ simulate or sample rather than compare compiled circuits, so they
+are still run on their own.
+
+Usage:
+    python run_all_demos.py
+"""
+
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_ROOT))
+from _transpile_cache import cached_transpile_stats_many
+
+# (title, demo script, parameters) - same parameters as each demo's __main__
+DEMOS = [
+    ("Demo 1: Finance - American Option Comparator",
+     "01-Finance-AmericanOptions/finance_comparator_demo.py",
+     {'num_state_qubits': 5, 'value_to_compare': 11}),
+    ("Demo 2: Chemistry - VQE Ansatz Efficiency",
+     "02-Chemistry-CarbonCapture/chemistry_vqe_demo.py",
+     {'n_qubits': 6}),
+    ("Demo 3: Hardware - Connectivity Challenge",
+     "03-Hardware-Connectivity/connectivity_challenge.py",
+     {'n_qubits': 10}),
+]
+
+
+def _load_demo(relative_path):
+    """Import a demo script by path (demo folders are not packages)."""
+    path = REPO_ROOT / relative_path
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_all_demos():
+    """
+    Compile every demo in one batch and return their rendered reports.
+
+    Returns:
+        List of (title, report_text), in DEMOS order
+    """
+    modules = [_load_demo(script) for _, script, _ in DEMOS]
+
+    # Flatten every demo's compile jobs into one batch
+    jobs, spans = [], []
+    for module, (_, _, params) in zip(modules, DEMOS):
+        demo_jobs = module.compile_jobs(**params)
+        spans.append((len(jobs), len(jobs) + len(demo_jobs)))
+        jobs.extend(demo_jobs)
+
+    results = cached_transpile_stats_many(jobs)
+
+    reports = []
+    for module, (title, _, params), (start, end) in zip(modules, DEMOS, spans):
+        stats = module.compute_stats(**params, compiled=results[start:end])
+        reports.append((title, module.format_report(stats)))
+    return reports
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    reports = run_all_demos()
+    elapsed = time.perf_counter() - start
+
+    # One write for the whole suite, so concurrent runs don't interleave
+    rule = '=' * 70
+    sys.stdout.write(''.join(f"\n{rule}\n{title}\n{rule}\n{report}" for title, report in reports)
+                     + f"\n✓ {len(reports)} demos compiled in {elapsed:.1f}s\n")